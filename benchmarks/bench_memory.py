@@ -0,0 +1,59 @@
+# Measures memory per employee for the parsed API records and for the table model's columns, run with: python benchmarks/bench_memory.py
+# The records go through json like they do off the network, so no string starts out shared.
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PySide6.QtWidgets import QApplication
+import table_model
+from table_model import EmployeeTableModel
+
+COUNTRIES = ["Germany", "United States", "France", "Japan", "Brazil", "India", "Canada", "Spain", "Italy", "Mexico"]
+TITLES = ["Engineer", "Senior Engineer", "Manager", "Analyst", "Designer", "Sales", "Support", "Director"]
+
+def make_payload(count): # the JSON body a full /getdata would send, names and streets unique, the rest repeating
+    random.seed(1)
+    return json.dumps({"employees": [
+        {"id": f"{i:08x}-0000-4000-8000-{i:012x}",
+         "name": {"first_name": f"First{i}", "middle_name": random.choice("ABCDEFGH"), "last_name": f"Last{i % 5000}"},
+         "age": random.randint(20, 65), "title": random.choice(TITLES),
+         "address": {"address_1": f"{i} Main St", "address_2": "", "country": random.choice(COUNTRIES)},
+         "misc": ""} for i in range(count)]})
+
+def measured(build): # bytes still allocated once build() is done, and what it returned
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+def filled(payload):
+    model = EmployeeTableModel()
+    model.set_records(json.loads(payload)["employees"])
+    return model
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    shared = table_model.SHARED
+    for count in (10000, 100000, 200000):
+        payload = make_payload(count)
+        print(f"--- {count} employees")
+        size, records = measured(lambda: json.loads(payload)["employees"])
+        print(f"{'parsed API records (nested dicts)':<40} {size / count:>8.0f} bytes/employee")
+        del records
+        table_model.SHARED = []
+        size, model = measured(lambda: filled(payload))
+        print(f"{'model columns, no interning':<40} {size / count:>8.0f} bytes/employee")
+        del model
+        table_model.SHARED = shared
+        size, model = measured(lambda: filled(payload))
+        print(f"{'model columns, repeated values shared':<40} {size / count:>8.0f} bytes/employee")
+        del model
@@ -0,0 +1,38 @@
+# Times building the search index and search-as-you-type queries over it, run with: python benchmarks/bench_search.py
+# Each query is timed as the search box runs it, the index lookup plus the proxy mapping ids back to rows.
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PySide6.QtWidgets import QApplication
+from table_model import EmployeeTableModel
+from filtering import FilterSortModel
+from search import SearchIndex
+from bench_table_fill import make_records
+
+QUERIES = [('prefix', 'la'), ('prefix', '12'), ('prefix', 'last12'), ('prefix', 'last123 engineer'), ('substring', 'ast12'),
+           ('prefix', 'la last12'), ('substring', 'germ'), ('substring', 'ain st'), ('fuzzy', 'lsat12'), ('fuzzy', 'enigneer')]
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    for count in (10000, 100000, 200000):
+        model = EmployeeTableModel()
+        index = SearchIndex()
+        index.follow(model)
+        proxy = FilterSortModel(model)
+        start = time.perf_counter()
+        model.set_records(make_records(count))
+        index.index_queued(None)  # the window does this a slice at a time between events
+        print(f"--- {count} rows, index built in {(time.perf_counter() - start) * 1000:.0f} ms (with the table fill)")
+        start = time.perf_counter()
+        index.vocabulary_text()
+        print(f"sorted vocabulary built in {(time.perf_counter() - start) * 1000:.0f} ms (once, by the first search)")
+        for mode, query in QUERIES:
+            proxy.set_search(lambda: index.search(query, mode))
+            start = time.perf_counter()
+            proxy.refresh()
+            elapsed = time.perf_counter() - start
+            print(f"{mode:<10} {query!r:<22} {elapsed * 1000:>8.1f} ms {proxy.rowCount():>8} matches")
@@ -0,0 +1,40 @@
+# Times a full table fill for growing record counts, run with: python benchmarks/bench_table_fill.py
+# Time per row should stay roughly flat as N grows, i.e. the fill is linear in N.
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PySide6.QtWidgets import QApplication, QTableView
+from table_model import EmployeeTableModel, ColumnSizer
+
+def make_records(count):
+    return [{"id": f"id-{i}",
+             "name": {"first_name": f"First{i}", "middle_name": "M", "last_name": f"Last{i % 977}"},
+             "age": 20 + i % 50,
+             "title": "Engineer",
+             "address": {"address_1": f"{i} Main St", "address_2": "", "country": "Germany"},
+             "misc": ""} for i in range(count)]
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    view = QTableView()
+    model = EmployeeTableModel()
+    view.setModel(model)
+    sizer = ColumnSizer(view)
+    view.show()
+    with sizer.batch():  # warm up so window and font setup aren't counted in the first run
+        model.set_records(make_records(100))
+    app.processEvents()
+
+    print(f"{'rows':>8} {'seconds':>10} {'us/row':>8}")
+    for count in (1000, 4000, 16000, 64000):
+        records = make_records(count)
+        start = time.perf_counter()
+        with sizer.batch():
+            model.set_records(records)
+        app.processEvents()
+        elapsed = time.perf_counter() - start
+        print(f"{count:>8} {elapsed:>10.3f} {elapsed / count * 1e6:>8.2f}")
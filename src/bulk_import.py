@@ -0,0 +1,169 @@
+import csv
+import os
+import time
+import uuid
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
+from PySide6.QtCore import QObject, Signal
+from table_model import COLUMNS
+from formats import format_for
+
+def read_chunks(reader, chunk_rows): # yields lists of at most chunk_rows rows so only one chunk is ever in memory
+    while True:
+        chunk = list(islice(reader, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+class BulkImport(QObject): # streams a CSV, JSON Lines, Parquet or Arrow file into the API in batches with a bounded number of requests in flight
+    progress = Signal(int, int, int, float)  # per mille of the file read, rows imported, rows failed, rows/sec
+    rows_imported = Signal(list)  # table rows the server accepted, sent in batches
+    finished = Signal(dict)  # summary once the file is done or the import was cancelled
+
+    def __init__(self, api, filename, employee_data, is_loaded, concurrency=8, chunk_rows=500,
+                 stream_threshold=64 * 1024 * 1024, display_rows=10000, seen_limit=1000000):
+        super().__init__()
+        self.api = api
+        self.filename = filename
+        self.employee_data = employee_data  # converts the ten column values into the API's format
+        self.is_loaded = is_loaded  # id -> whether the table has that employee, asked every time as the table's index is replaced on resets
+        self.seen_ids = set()  # IDs already taken from this file, their hashes in streaming mode
+        self.concurrency = concurrency
+        self.chunk_rows = chunk_rows
+
+        # files past the threshold are imported in streaming mode: only the hashes of the first seen_limit IDs are
+        # remembered, so repeats of later IDs aren't caught, and only the first display_rows imported rows are shown
+        self.streaming = os.path.getsize(filename) >= stream_threshold
+        self.seen_limit = seen_limit if self.streaming else None
+        self.unchecked = 0  # rows whose IDs came after seen_limit and weren't remembered
+        self.display_rows = display_rows if self.streaming else None
+        self.displayed = 0
+
+        self.failed_file = None
+        self.failed_writer = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self): # runs on a worker thread, everything it reports goes out through signals
+        summary = {'filename': self.filename, 'imported': 0, 'skipped': 0, 'failed': 0, 'failed_samples': [],
+                   'cancelled': False, 'error': None, 'failed_file': None, 'streaming': self.streaming,
+                   'displayed': 0, 'unchecked': 0}
+        start = time.perf_counter()
+
+        try:
+            with format_for(self.filename).read() as reader, ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                if not set(COLUMNS).issubset(reader.fieldnames or []):
+                    summary['error'] = "CSV file is missing required columns"
+                    self.finished.emit(summary)
+                    return
+
+                in_flight = {}
+                for chunk in read_chunks(reader.rows, self.chunk_rows):
+                    if self.cancelled:
+                        break
+                    accepted = []
+                    batch = []
+                    for row in chunk:
+                        values, data, reason = self.convert(row)
+                        if values is None:
+                            if reason:
+                                self.fail(summary, row, reason)
+                            else:
+                                summary['skipped'] += 1
+                            continue
+                        batch.append((row, values, data))
+                        if len(batch) >= self.api.batch_size:
+                            self.submit(pool, in_flight, batch, summary, accepted)
+                            batch = []
+                    if batch:
+                        self.submit(pool, in_flight, batch, summary, accepted)
+
+                    self.show(accepted)
+                    self.report(reader.read_per_mille(), summary, time.perf_counter() - start)
+
+                if self.cancelled:
+                    for future in in_flight:
+                        future.cancel()
+                accepted = []
+                self.collect(in_flight, summary, accepted, ALL_COMPLETED)
+                self.show(accepted)
+        finally:
+            if self.failed_file:
+                self.failed_file.close()
+
+        summary['cancelled'] = self.cancelled
+        summary['seconds'] = time.perf_counter() - start
+        summary['failed_file'] = self.failed_file.name if self.failed_file else None
+        summary['displayed'] = self.displayed
+        summary['unchecked'] = self.unchecked
+        self.report(1000, summary, summary['seconds'])
+        self.finished.emit(summary)
+
+    def convert(self, row): # returns (values, data, None), (None, None, reason) for a bad row or all None to skip it
+        if any(row.get(column) is None for column in COLUMNS):
+            return None, None, "row is missing fields"
+        id = row['ID'].strip() or str(uuid.uuid4())  # If ID is blank or empty generate one
+        key = hash(id) if self.streaming else id  # a hash takes far less memory than the ID, a clash is vanishingly rare
+        if key in self.seen_ids or self.is_loaded(id):
+            return None, None, None
+        values = (id,) + tuple(row[column] for column in COLUMNS[1:])
+        try:
+            data = self.employee_data(*values)
+        except ValueError as e:
+            return None, None, f"invalid value: {e}"
+        if self.seen_limit is None or len(self.seen_ids) < self.seen_limit:
+            self.seen_ids.add(key)
+        else:
+            self.unchecked += 1
+        return values, data, None
+
+    def submit(self, pool, in_flight, batch, summary, accepted):
+        # keep at most `concurrency` batches waiting on the server, each batch sends its per-item
+        # fallback requests one at a time so the total in flight stays at `concurrency`
+        while len(in_flight) >= self.concurrency:
+            self.collect(in_flight, summary, accepted, FIRST_COMPLETED)
+        in_flight[pool.submit(self.api.send_post_many, [data for _, _, data in batch], 1)] = batch
+
+    def collect(self, in_flight, summary, accepted, return_when):
+        done, _ = wait(in_flight, return_when=return_when)
+        for future in done:
+            batch = in_flight.pop(future)
+            if future.cancelled():
+                for row, _, _ in batch:
+                    self.fail(summary, row, "cancelled")
+                continue
+            try:
+                results, reason = future.result(), "server rejected the row"
+            except Exception as e:
+                results, reason = [False] * len(batch), str(e)
+            for (row, values, _), ok in zip(batch, results):
+                if ok:
+                    summary['imported'] += 1
+                    accepted.append(values)
+                else:  # None means the server stopped answering after taking the batch, it may have added the row
+                    self.fail(summary, row, "no answer from the server, it may have been added" if ok is None else reason)
+
+    def show(self, accepted): # hands imported rows to the table, up to the display window in streaming mode
+        if self.display_rows is not None:
+            accepted = accepted[:max(self.display_rows - self.displayed, 0)]
+        if accepted:
+            self.displayed += len(accepted)
+            self.rows_imported.emit(accepted)
+
+    def fail(self, summary, row, reason): # failed rows go straight to disk next to the source file so they can be imported again
+        summary['failed'] += 1
+        if len(summary['failed_samples']) < 10:
+            summary['failed_samples'].append((row.get('ID'), reason))
+        if self.failed_writer is None:
+            root, ext = os.path.splitext(self.filename)
+            failed = f"{root}.failed.csv" if ext.lower() in ('.csv', '') else f"{self.filename}.failed.csv"  # always CSV
+            self.failed_file = open(failed, 'w', newline='')
+            self.failed_writer = csv.DictWriter(self.failed_file, fieldnames=COLUMNS + ['Error'], extrasaction='ignore')
+            self.failed_writer.writeheader()
+        self.failed_writer.writerow({**row, 'Error': reason})
+
+    def report(self, read, summary, elapsed):
+        rate = summary['imported'] / elapsed if elapsed > 0 else 0.0
+        self.progress.emit(min(int(read), 1000), summary['imported'], summary['failed'], rate)
@@ -0,0 +1,132 @@
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+class CachedResponse:
+    __slots__ = ('etag', 'last_modified', 'body')
+
+    def __init__(self, etag, last_modified, body):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+
+    def validators(self): # headers that let the server answer 304 Not Modified instead of resending the body
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ResponseCache: # on-disk cache of GET bodies keyed by URL and query, shared by all request threads
+    def __init__(self, path, ttl=24 * 3600, max_bytes=256 * 1024 * 1024, max_entry_bytes=64 * 1024 * 1024):
+        self.ttl = ttl  # seconds an entry is trusted since it was last stored or revalidated
+        self.max_bytes = max_bytes  # compressed size of the whole cache, least recently used entries go first
+        self.max_entry_bytes = max_entry_bytes  # bodies bigger than this aren't cached
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                            "body BLOB, size INTEGER, stored REAL, used REAL)")
+
+    @staticmethod
+    def key(url, params=None):
+        return f"{url}?{urlencode(sorted((params or {}).items()))}"
+
+    def get(self, key): # the cached response, or None when there's none or it's past its TTL
+        now = time.time()
+        with self.lock, self.db:
+            row = self.db.execute("SELECT etag, last_modified, body, stored FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[3] > self.ttl:
+                self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self.db.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+        return CachedResponse(row[0], row[1], zlib.decompress(row[2]))
+
+    def put(self, key, etag, last_modified, body):
+        if len(body) > self.max_entry_bytes:
+            return
+        blob = zlib.compress(body, 1)
+        now = time.time()
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (key, etag, last_modified, blob, len(blob), now, now))
+            self.evict()
+
+    def touch(self, key): # the server said 304, so the entry is good for another TTL
+        now = time.time()
+        with self.lock, self.db:
+            self.db.execute("UPDATE responses SET stored = ?, used = ? WHERE key = ?", (now, now, key))
+
+    def evict(self): # called with the lock held
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY used").fetchall():
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM responses")
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+class LookupCache: # small in-memory LRU of single-employee GET results, keyed by id
+    def __init__(self, capacity=256, ttl=60):
+        self.capacity = capacity  # most ids kept, the least recently used goes first
+        self.ttl = ttl  # seconds a result is trusted, 0 turns the cache off
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # id -> (time stored, data)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, id):
+        with self.lock:
+            entry = self.entries.get(id)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+                self.entries.move_to_end(id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self.entries[id]
+            self.misses += 1
+            return None
+
+    def put(self, id, data):
+        if self.capacity <= 0 or self.ttl <= 0:
+            return
+        with self.lock:
+            self.entries[id] = (time.monotonic(), data)
+            self.entries.move_to_end(id)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, ids): # called when this client changes or deletes those employees
+        with self.lock:
+            for id in ids:
+                self.entries.pop(id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {'size': len(self.entries), 'capacity': self.capacity, 'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': self.hits / total if total else None}
+
+    def reset_stats(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,103 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, Signal
+from table_model import record_fields
+from formats import format_for
+
+class EmployeeExport(QObject): # writes employees to a file on a worker thread, from the table or page by page from the server
+    # the format comes from the file name's extension, see formats.py
+    progress = Signal(int, int, float)  # rows written, rows expected (0 while unknown), rows/sec
+    finished = Signal(dict)  # summary once the file is written, failed or the export was cancelled
+
+    def __init__(self, filename, chunk_rows=5000, buffer_bytes=1024 * 1024):
+        super().__init__()
+        self.filename = filename
+        self.chunk_rows = chunk_rows  # rows handed to the format's writer at a time
+        self.buffer_bytes = buffer_bytes  # the file is written in blocks this big
+        self.chunks = iter(())
+        self.total = 0
+        self.cancelled = False
+
+    def from_table(self, columns, rows=None): # exports loaded rows, call on the GUI thread since it copies them
+        # columns are the model's column lists and rows the source rows in the order the table shows them,
+        # None for all of them, copied here so paging and live updates can carry on during the export
+        columns = [list(column) for column in columns]
+        rows = None if rows is None else list(rows)
+        self.total = len(columns[0]) if rows is None else len(rows)
+        self.chunks = self.table_chunks(columns, rows)
+        return self
+
+    def from_server(self, api, params=None, page_size=5000): # exports everything /getdata has without loading it into the table
+        self.chunks = self.server_chunks(api, dict(params or {}), page_size)
+        return self
+
+    def cancel(self):
+        self.cancelled = True
+
+    def table_chunks(self, columns, rows):
+        for start in range(0, self.total, self.chunk_rows):
+            if rows is None:
+                yield list(zip(*(column[start:start + self.chunk_rows] for column in columns)))
+            else:
+                part = rows[start:start + self.chunk_rows]
+                yield list(zip(*(map(column.__getitem__, part) for column in columns)))
+
+    def server_chunks(self, api, params, page_size):
+        # the next page is downloaded while the current one is written, cursors are followed when the server sends them
+        def fetch(key):
+            meta = {}
+            rows = [record_fields(record) for record in api.send_get_stream(params, limit=page_size, meta=meta, **key)
+                    if isinstance(record, dict)]
+            return meta, rows
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(fetch, {'offset': 0})
+            offset = 0
+            first_id = None
+            while future is not None:
+                meta, rows = future.result()
+                future = None
+                if meta.get('error'):
+                    raise RuntimeError(f"GET /getdata failed: {meta['error']}")
+                if meta.get('total') is not None:
+                    self.total = meta['total']
+                if rows and rows[0][0] == first_id:  # the server ignores offsets, that was everything
+                    return
+                first_id = rows[0][0] if rows else None
+                offset += len(rows)
+                if self.cancelled:
+                    return
+                if meta.get('next_cursor'):
+                    future = pool.submit(fetch, {'cursor': meta['next_cursor']})
+                elif len(rows) == page_size:  # a short page, or a long one from a server that ignores paging, is the last
+                    future = pool.submit(fetch, {'offset': offset})
+                yield rows
+
+    def run(self): # runs on a worker thread, writes to a .part file that only replaces the target once it's complete
+        summary = {'filename': self.filename, 'written': 0, 'cancelled': False, 'error': None}
+        start = time.perf_counter()
+        partial = self.filename + '.part'
+        try:
+            with format_for(self.filename).write(partial, self.buffer_bytes) as writer:
+                for chunk in self.chunks:
+                    if self.cancelled:
+                        break
+                    writer.write_rows(chunk)
+                    summary['written'] += len(chunk)
+                    self.report(summary['written'], time.perf_counter() - start)
+            if self.cancelled:
+                os.remove(partial)
+            else:
+                os.replace(partial, self.filename)
+        except (OSError, RuntimeError) as e:
+            summary['error'] = str(e)
+            if os.path.exists(partial):
+                os.remove(partial)
+        summary['cancelled'] = self.cancelled
+        summary['seconds'] = time.perf_counter() - start
+        self.finished.emit(summary)
+
+    def report(self, written, elapsed):
+        rate = written / elapsed if elapsed > 0 else 0.0
+        self.progress.emit(written, self.total, rate)
@@ -0,0 +1,458 @@
+import sys
+import time
+from array import array
+from itertools import compress, repeat
+from operator import add, mul, sub
+from PySide6.QtCore import QAbstractProxyModel, QModelIndex, Qt, QTimer, Signal
+from PySide6.QtGui import QIntValidator
+from PySide6.QtWidgets import QApplication, QComboBox, QHBoxLayout, QLabel, QLineEdit, QPushButton, QWidget
+from table_model import COLUMNS, SHARED
+
+AGE = COLUMNS.index('Age')
+
+def age_of(value): # the age in a cell as an integer, -1 when it's blank or not a number
+    return int(value) if value.strip().isdigit() else -1
+
+class FilterSortModel(QAbstractProxyModel): # filtered and sorted view of the employee model, without copying any rows
+    filtered = Signal(int, int, float)  # visible rows, loaded rows, seconds the last filter and sort took
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.filters = {}  # column -> lower-case text the column has to contain
+        self.age_range = (None, None)  # inclusive, either end may be open
+        self.sort_keys = []  # (column, descending), most important first
+        self.search = None  # returns the ids matching the search box, called again whenever the rows change
+        self.rows = None  # source row of every visible row, None while nothing is filtered or sorted
+        self.positions = None  # the reverse of rows, built when first needed
+        self.lowered = {}  # column -> lower-cased copy of the column, dropped whenever the source changes
+        self.ages = None  # the age column as integers, -1 where it's blank
+        self.ranks = {}  # column -> (each row's place among the column's sorted values, lowest place, highest place)
+        self.resetting = False
+        self.edited = set()  # source rows edited or appended since the last check whether they're still in place
+        self.identity = array('l')  # 0, 1, 2... kept so every row in order is a quick copy instead of a count
+
+        # edited rows and inserted rows at the bottom are checked a little later so a burst of them costs one check
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(100)
+        self.timer.timeout.connect(self.settle)
+        self.setSourceModel(source)
+
+    def setSourceModel(self, source):
+        super().setSourceModel(source)
+        self.source = source
+        source.modelAboutToBeReset.connect(self.source_resetting)
+        source.modelReset.connect(self.source_reset)
+        source.rowsAboutToBeInserted.connect(self.rows_inserting)
+        source.rowsInserted.connect(self.rows_inserted)
+        source.rowsAboutToBeRemoved.connect(self.rows_removing)
+        source.rowsRemoved.connect(self.rows_removed)
+        source.dataChanged.connect(self.source_changed)
+
+    def active(self):
+        return bool(self.filters) or self.age_range != (None, None) or bool(self.sort_keys) or self.search is not None
+
+    # --- keeping up with the source model ---
+    # while nothing is filtered or sorted every change is passed straight through, otherwise changes
+    # that move source rows re-run the filter straight away since self.rows would point at the wrong rows,
+    # and edits are shown where they are and only move once they no longer pass the filter or sort there
+
+    def forget(self):
+        self.lowered = {}
+        self.ages = None
+        self.ranks = {}
+        self.edited = set()
+
+    def relower(self, first, last): # brings the cached copies of the columns up to date for edited rows
+        self.ranks = {}  # an edited value can fall between two others, so places are worked out again when next sorted
+        for column, values in self.lowered.items():
+            values[first:last + 1] = [value.lower() for value in self.source.columns[column][first:last + 1]]
+        if self.ages is not None:
+            for row in range(first, last + 1):
+                value = self.source.columns[AGE][row]
+                self.ages[row] = age_of(value)
+
+    def source_resetting(self):
+        self.beginResetModel()
+
+    def source_reset(self):
+        self.forget()
+        self.rows = self.compute()
+        self.positions = None
+        self.endResetModel()
+
+    def rows_inserting(self, parent, first, last):
+        if self.rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+        elif first < self.source.rowCount():
+            self.resetting = True
+            self.beginResetModel()
+
+    def rows_inserted(self, parent, first, last):
+        self.forget()
+        if self.rows is None:
+            self.endInsertRows()
+        elif self.resetting:
+            self.resetting = False
+            self.rows = self.compute()
+            self.positions = None
+            self.endResetModel()
+        else:  # appended rows don't move the ones already mapped
+            self.edited.update(range(first, last + 1))
+            self.timer.start()
+
+    def rows_removing(self, parent, first, last):
+        if self.rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def rows_removed(self, parent, first, last):
+        self.forget()
+        if self.rows is None:
+            self.endRemoveRows()
+        else:
+            self.rows = self.compute()
+            self.positions = None
+            self.endResetModel()
+
+    def source_changed(self, top_left, bottom_right, roles=()):
+        first, last = top_left.row(), bottom_right.row()
+        self.relower(first, last)
+        if self.rows is None:
+            self.dataChanged.emit(self.index(first, top_left.column()), self.index(last, bottom_right.column()), roles)
+            return
+        for row in range(first, last + 1):
+            index = self.mapFromSource(self.source.index(row, 0))
+            if index.isValid():
+                self.dataChanged.emit(self.index(index.row(), top_left.column()),
+                                      self.index(index.row(), bottom_right.column()), roles)
+        self.edited.update(range(first, last + 1))
+        self.timer.start()
+
+    def settle(self): # re-runs the filter and sort if an edited or appended row no longer belongs where it is
+        rows, self.edited = self.edited, set()
+        if self.rows is None or not rows:
+            return
+        matches = None if self.search is None else self.search()
+        for row in rows:
+            index = self.mapFromSource(self.source.index(row, 0))
+            if self.accepts(row, matches) != index.isValid() or (index.isValid() and not self.in_order(index.row())):
+                self.relayout()
+                return
+
+    def accepts(self, row, matches): # whether a source row passes the search, filters and age range
+        if matches is not None and self.source.columns[0][row] not in matches:
+            return False
+        if any(text not in self.lower(column)[row] for column, text in self.filters.items()):
+            return False
+        bounds = self.age_bounds()
+        return bounds is None or bounds[0] <= self.age_values()[row] <= bounds[1]
+
+    def in_order(self, position): # whether the row at position still sorts between its neighbours
+        rows = self.rows
+        return ((position == 0 or self.before(rows[position - 1], rows[position])) and
+                (position == len(rows) - 1 or self.before(rows[position], rows[position + 1])))
+
+    def before(self, a, b): # whether source row a sorts ahead of b, ties keep the source order like the stable sorts do
+        for column, descending in self.sort_keys:
+            values = self.age_values() if column == AGE else self.lower(column)
+            if values[a] != values[b]:
+                return values[a] > values[b] if descending else values[a] < values[b]
+        return a < b
+
+    def relayout(self): # re-runs the filter and sort as a layout change, the selection and current row stay on their employees
+        self.timer.stop()
+        self.edited = set()
+        self.layoutAboutToBeChanged.emit()
+        before = self.persistentIndexList()
+        sources = [self.source.index(self.source_row(index.row()), index.column()) for index in before]
+        self.rows = self.compute()
+        self.positions = None
+        self.changePersistentIndexList(before, [self.mapFromSource(index) for index in sources])
+        self.layoutChanged.emit()
+
+    # --- filtering and sorting ---
+
+    def set_filter(self, column, text):
+        text = text.strip().lower()
+        if text:
+            self.filters[column] = text
+        else:
+            self.filters.pop(column, None)
+
+    def set_search(self, search):
+        self.search = search
+
+    def set_age_range(self, low, high):
+        self.age_range = (low, high)
+
+    def sort_by(self, column, add=False): # clicking the same column again flips it, add keeps the earlier keys
+        keys = dict(self.sort_keys)
+        if add:
+            keys[column] = not keys[column] if column in keys else False
+            self.sort_keys = list(keys.items())
+        else:
+            self.sort_keys = [(column, not keys[column] if column in keys and len(keys) == 1 else False)]
+
+    def clear(self):
+        self.filters = {}
+        self.age_range = (None, None)
+        self.sort_keys = []
+        self.search = None
+        self.refresh()
+
+    def refresh(self):
+        self.timer.stop()
+        self.edited = set()
+        self.beginResetModel()
+        self.rows = self.compute()
+        self.positions = None
+        self.endResetModel()
+
+    def lower(self, column):
+        if column not in self.lowered:
+            values = self.source.columns[column]
+            if column in SHARED:  # few distinct values, lower each once and let the rows share the results
+                lowered = {value: value.lower() for value in set(values)}
+                self.lowered[column] = list(map(lowered.__getitem__, values))
+            else:
+                self.lowered[column] = [value.lower() for value in values]
+        return self.lowered[column]
+
+    def everyone(self): # every source row in order
+        count = self.source.rowCount()
+        if len(self.identity) < count:
+            self.identity = array('l', range(max(count, 2 * len(self.identity))))
+        return self.identity[:count]
+
+    def age_values(self):
+        if self.ages is None:
+            column = self.source.columns[AGE]
+            ages = {value: age_of(value) for value in set(column)}  # few distinct ages, each is parsed once
+            self.ages = array('l', map(ages.__getitem__, column))
+        return self.ages
+
+    def age_bounds(self): # (low, high) an age has to fall within, inclusive, None without an age range
+        low, high = self.age_range
+        if low is None and high is None:
+            return None
+        return 0 if low is None else low, sys.maxsize if high is None else high  # blank ages (-1) never pass
+
+    def rank(self, column): # (place of each row's value among the column's sorted values, lowest, highest)
+        if column not in self.ranks:
+            if column == AGE:  # the ages already sort as numbers
+                ages = self.age_values()
+                self.ranks[column] = (ages, min(ages, default=0), max(ages, default=0))
+            else:
+                values = self.lower(column)
+                places = {value: place for place, value in enumerate(sorted(set(values)))}
+                self.ranks[column] = (array('l', map(places.__getitem__, values)), 0, max(len(places) - 1, 0))
+        return self.ranks[column]
+
+    def sort_key(self): # one integer per source row that orders the rows by every sort key at once
+        key = None
+        for column, descending in self.sort_keys:
+            places, low, high = self.rank(column)
+            if key is None and not descending and len(self.sort_keys) == 1:
+                return places
+            places = map(sub, repeat(high), places) if descending else map(sub, places, repeat(low))
+            key = places if key is None else map(add, map(mul, key, repeat(high - low + 1)), places)
+        return list(key)
+
+    def compute(self): # the source rows to show, in order, or None for all of them as they are
+        if not self.active():
+            self.filtered.emit(self.source.rowCount(), self.source.rowCount(), 0.0)
+            return None
+        start = time.perf_counter()
+        rows = None
+        if self.search is not None:
+            matches = self.search()
+            count = self.source.rowCount()
+            if len(matches) == count == len(self.source.rows_by_id):
+                pass  # the index only holds loaded employees, so that's everyone, same as no search
+            elif len(matches) > count // 16:  # a big share of the rows, one pass over them in order beats sorting lookups
+                rows = list(compress(range(count), map(matches.__contains__, self.source.columns[0])))
+            else:
+                rows_by_id = self.source.rows_by_id
+                rows = sorted(rows_by_id[id] for id in matches if id in rows_by_id)
+            if rows is not None and len(rows) == count:
+                rows = None  # matched everyone, same as no search
+        for column, text in self.filters.items():
+            values = self.lower(column)
+            if rows is None:
+                rows = [row for row, value in enumerate(values) if text in value]
+            else:
+                rows = [row for row in rows if text in values[row]]
+        bounds = self.age_bounds()
+        if bounds is not None:
+            ages = self.age_values()
+            low, high = bounds
+            if rows is None:
+                rows = [row for row, age in enumerate(ages) if low <= age <= high]
+            else:
+                rows = [row for row in rows if low <= ages[row] <= high]
+        if rows is None:
+            rows = self.everyone()
+        if self.sort_keys:  # sorting is stable and rows are in source order, so ties keep it
+            rows = sorted(rows, key=self.sort_key().__getitem__)
+        if not isinstance(rows, array):
+            rows = array('l', rows)
+        self.filtered.emit(len(rows), self.source.rowCount(), time.perf_counter() - start)
+        return rows
+
+    # --- QAbstractProxyModel ---
+
+    def source_row(self, row): # the employee model's row behind a row of this model
+        return row if self.rows is None else self.rows[row]
+
+    def mapToSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.source.index(self.source_row(index.row()), index.column())
+
+    def mapFromSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        if self.rows is None:
+            return self.index(index.row(), index.column())
+        if self.positions is None:
+            self.positions = {row: position for position, row in enumerate(self.rows)}
+        position = self.positions.get(index.row())
+        return QModelIndex() if position is None else self.index(position, index.column())
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.source.rowCount() if self.rows is None else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or column < 0 or row >= self.rowCount() or column >= len(COLUMNS):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def data(self, index, role=Qt.DisplayRole): # reads the columns directly, the view only asks for the rows on screen
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        return self.source.columns[index.column()][self.source_row(index.row())]
+
+    def setData(self, index, value, role=Qt.EditRole):
+        return self.source.setData(self.mapToSource(index), value, role)
+
+    def flags(self, index):
+        return self.source.flags(self.mapToSource(index))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return str(section + 1)
+
+class FilterBar(QWidget): # the search box, filter and sort controls above the table
+    def __init__(self, proxy, view, index, parent=None):
+        super().__init__(parent)
+        self.proxy = proxy
+        self.view = view
+        self.index = index  # SearchIndex over the loaded employees, for the search box
+        self.edits = {}
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.line_search = QLineEdit()
+        self.line_search.setPlaceholderText("Search all fields")
+        self.line_search.setClearButtonEnabled(True)
+        self.line_search.textChanged.connect(self.changed)
+        layout.addWidget(self.line_search, 2)
+        self.combo_search_mode = QComboBox()
+        self.combo_search_mode.addItems(['Prefix', 'Substring', 'Fuzzy'])
+        self.combo_search_mode.currentIndexChanged.connect(self.changed)
+        layout.addWidget(self.combo_search_mode)
+        for title in ('Last Name', 'Country', 'Title'):
+            edit = QLineEdit()
+            edit.setPlaceholderText(f"Filter {title.lower()}")
+            edit.setClearButtonEnabled(True)
+            edit.textChanged.connect(self.changed)
+            layout.addWidget(edit)
+            self.edits[COLUMNS.index(title)] = edit
+        self.line_min_age = QLineEdit()
+        self.line_max_age = QLineEdit()
+        for edit, text in ((self.line_min_age, "Min age"), (self.line_max_age, "Max age")):
+            edit.setPlaceholderText(text)
+            edit.setValidator(QIntValidator(0, 200, edit))
+            edit.setMaximumWidth(70)
+            edit.textChanged.connect(self.changed)
+            layout.addWidget(edit)
+        self.button_clear = QPushButton("Clear")
+        self.button_clear.clicked.connect(self.clear)
+        layout.addWidget(self.button_clear)
+        self.label = QLabel()
+        layout.addWidget(self.label)
+
+        # typing re-filters once it pauses
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(150)
+        self.timer.timeout.connect(self.apply)
+
+        # a header click sorts by that column, shift-click adds it as the next sort key
+        header = view.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(False)
+        header.sectionClicked.connect(self.header_clicked)
+        proxy.filtered.connect(self.show_count)
+        index.indexed.connect(self.reindexed)
+
+    def changed(self):
+        self.timer.start()
+
+    def apply(self):
+        for column, edit in self.edits.items():
+            self.proxy.set_filter(column, edit.text())
+        self.proxy.set_age_range(self.age(self.line_min_age), self.age(self.line_max_age))
+        query = self.line_search.text()
+        mode = self.combo_search_mode.currentText().lower()
+        if any(len(word) >= 2 for word in query.split()):  # single letters would match nearly everyone
+            self.proxy.set_search(lambda: self.index.search(query, mode))
+        else:
+            self.proxy.set_search(None)
+        self.proxy.refresh()
+
+    def reindexed(self): # the index caught up with the table, a search may find more than it did
+        if self.proxy.search is not None:
+            self.proxy.relayout()
+
+    def age(self, edit):
+        return int(edit.text()) if edit.text() else None
+
+    def header_clicked(self, column):
+        add = bool(QApplication.keyboardModifiers() & Qt.ShiftModifier)
+        self.proxy.sort_by(column, add)
+        column, descending = self.proxy.sort_keys[0]
+        header = self.view.horizontalHeader()
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(column, Qt.DescendingOrder if descending else Qt.AscendingOrder)
+        self.proxy.refresh()
+
+    def clear(self):
+        self.timer.stop()
+        for edit in (self.line_search, *self.edits.values(), self.line_min_age, self.line_max_age):
+            edit.blockSignals(True)
+            edit.clear()
+            edit.blockSignals(False)
+        self.view.horizontalHeader().setSortIndicatorShown(False)
+        self.proxy.clear()
+
+    def show_count(self, shown, loaded, seconds):
+        text = f"{shown} of {loaded} employees" if shown != loaded or self.proxy.active() else ""
+        if self.proxy.sort_keys:
+            order = ", ".join(f"{COLUMNS[column]} {'desc' if descending else 'asc'}" for column, descending in self.proxy.sort_keys)
+            text += f", sorted by {order}"
+        if self.proxy.active():
+            text += f" ({seconds * 1000:.0f} ms)"
+        self.label.setText(text)
@@ -0,0 +1,220 @@
+import csv
+import gzip
+import importlib
+import io
+import json
+import os
+from table_model import COLUMNS, record_fields
+
+NAME_FIELDS = ('first_name', 'middle_name', 'last_name')
+ADDRESS_FIELDS = ('address_1', 'address_2', 'country')
+
+def optional(module, package, format): # imports a package only some formats need, with an error that says what to install
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise RuntimeError(f"{format} files need the {package} package, install it with: pip install {package}") from None
+
+def nested(values): # the API's employee record for the ten column strings, the other way round from record_fields
+    id, first_name, middle_name, last_name, age, title, address1, address2, country, misc = values
+    age = age.strip()
+    return {"id": id,
+            "name": {"first_name": first_name, "middle_name": middle_name, "last_name": last_name},
+            "age": int(age) if age.isdigit() else None,
+            "title": title,
+            "address": {"address_1": address1, "address_2": address2, "country": country},
+            "misc": misc}
+
+def flat(record): # an employee record as the dict of column strings the importer reads, {} if it isn't one
+    return dict(zip(COLUMNS, record_fields(record))) if isinstance(record, dict) else {}
+
+class Format: # one file format, read as dicts keyed by the column names or written from rows of column strings
+    name = ''
+    extensions = ()
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.files = []  # everything opened, closed innermost first
+        self.raw = None  # the file on disk, its position says how much has been read
+        self.size = 1
+        self.fieldnames = COLUMNS
+        self.rows = iter(())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def opened(self, file):
+        self.files.append(file)
+        return file
+
+    def read(self): # opens the file for reading, the rows come from self.rows
+        self.raw = self.opened(open(self.filename, 'rb'))
+        self.size = os.path.getsize(self.filename) or 1
+        self.rows = self.read_rows()
+        return self
+
+    def read_per_mille(self):
+        return self.raw.tell() * 1000 // self.size
+
+    def write(self, path, buffer_bytes=1024 * 1024): # opens path for writing, e.g. the .part file of an export
+        self.raw = self.opened(open(path, 'wb', buffering=buffer_bytes))
+        self.start_writing()
+        return self
+
+    def close(self):
+        while self.files:
+            self.files.pop().close()
+
+    def read_rows(self):
+        raise NotImplementedError
+
+    def start_writing(self):
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        raise NotImplementedError
+
+class CsvFormat(Format): # the table's columns with their names as the header, what the app has always used
+    name = "CSV Files"
+    extensions = ('.csv',)
+
+    def read_rows(self):
+        reader = csv.DictReader(self.opened(io.TextIOWrapper(self.raw, newline='')))
+        self.fieldnames = reader.fieldnames  # reads the header, the columns are checked before any rows
+        return reader
+
+    def start_writing(self):
+        self.writer = csv.writer(self.opened(io.TextIOWrapper(self.raw, newline='')))
+        self.writer.writerow(COLUMNS)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+class JsonLinesFormat(Format): # one nested employee record per line, the same shape the API sends
+    name = "JSON Lines"
+    extensions = ('.jsonl',)
+
+    def decompressed(self, raw):
+        return raw
+
+    def compressed(self, raw):
+        return raw
+
+    def read_rows(self):
+        for line in self.opened(io.TextIOWrapper(self.opened(self.decompressed(self.raw)), encoding='utf-8')):
+            if not line.strip():
+                continue
+            try:
+                yield flat(json.loads(line))
+            except ValueError:
+                yield {}  # the importer reports it as a bad row
+
+    def start_writing(self):
+        self.text = self.opened(io.TextIOWrapper(self.opened(self.compressed(self.raw)), encoding='utf-8'))
+
+    def write_rows(self, rows):
+        self.text.write("".join(json.dumps(nested(values)) + "\n" for values in rows))
+
+class GzipJsonLinesFormat(JsonLinesFormat):
+    name = "Gzip JSON Lines"
+    extensions = ('.jsonl.gz',)
+
+    def decompressed(self, raw):
+        return gzip.GzipFile(fileobj=raw, mode='rb')
+
+    def compressed(self, raw):
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6)  # 9 is much slower for a few percent
+
+class ZstdJsonLinesFormat(JsonLinesFormat): # needs zstandard
+    name = "Zstandard JSON Lines"
+    extensions = ('.jsonl.zst',)
+
+    def decompressed(self, raw):
+        return optional('zstandard', 'zstandard', self.name).ZstdDecompressor().stream_reader(raw, closefd=False)
+
+    def compressed(self, raw):
+        return optional('zstandard', 'zstandard', self.name).ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+
+def arrow_schema(pa): # the nested employee record as Arrow types, name and address are structs
+    return pa.schema([('id', pa.string()),
+                      ('name', pa.struct([(field, pa.string()) for field in NAME_FIELDS])),
+                      ('age', pa.int64()),
+                      ('title', pa.string()),
+                      ('address', pa.struct([(field, pa.string()) for field in ADDRESS_FIELDS])),
+                      ('misc', pa.string())])
+
+class ArrowFormat(Format): # Arrow IPC files, read memory-mapped a record batch at a time, needs pyarrow
+    name = "Arrow IPC"
+    extensions = ('.arrow', '.feather')
+
+    def read(self):
+        pa = optional('pyarrow', 'pyarrow', self.name)
+        self.reader = pa.ipc.open_file(self.opened(pa.memory_map(self.filename, 'r')))
+        self.batches_read = 0
+        self.rows = self.read_rows()
+        return self
+
+    def read_rows(self):
+        for index in range(self.reader.num_record_batches):
+            self.batches_read = index + 1
+            yield from map(flat, self.reader.get_batch(index).to_pylist())
+
+    def read_per_mille(self):
+        return self.batches_read * 1000 // max(self.reader.num_record_batches, 1)
+
+    def start_writing(self):
+        self.pa = optional('pyarrow', 'pyarrow', self.name)
+        self.schema = arrow_schema(self.pa)
+        self.writer = self.opened(self.pa.ipc.new_file(self.raw, self.schema))
+
+    def write_rows(self, rows):
+        self.writer.write_batch(self.pa.RecordBatch.from_pylist([nested(values) for values in rows], schema=self.schema))
+
+class ParquetFormat(ArrowFormat): # compressed columnar files, read memory-mapped a row group at a time, needs pyarrow
+    name = "Parquet"
+    extensions = ('.parquet',)
+
+    def read(self):
+        pq = optional('pyarrow.parquet', 'pyarrow', self.name)
+        self.reader = pq.ParquetFile(self.filename, memory_map=True)
+        self.rows_read = 0
+        self.rows = self.read_rows()
+        return self
+
+    def read_rows(self):
+        for batch in self.reader.iter_batches(batch_size=10000):
+            self.rows_read += batch.num_rows
+            yield from map(flat, batch.to_pylist())
+
+    def read_per_mille(self):
+        return self.rows_read * 1000 // max(self.reader.metadata.num_rows, 1)
+
+    def start_writing(self):
+        self.pa = optional('pyarrow', 'pyarrow', self.name)
+        pq = optional('pyarrow.parquet', 'pyarrow', self.name)
+        self.schema = arrow_schema(self.pa)
+        self.writer = self.opened(pq.ParquetWriter(self.raw, self.schema, compression='zstd'))
+
+    def write_rows(self, rows):
+        self.writer.write_table(self.pa.Table.from_pylist([nested(values) for values in rows], schema=self.schema))
+
+FORMATS = [CsvFormat, JsonLinesFormat, GzipJsonLinesFormat, ZstdJsonLinesFormat, ParquetFormat, ArrowFormat]
+
+def format_for(filename): # the format a file name's extension asks for, CSV for anything else
+    name = filename.lower()
+    for format in FORMATS:
+        if name.endswith(format.extensions):
+            return format(filename)
+    return CsvFormat(filename)
+
+def file_filters(): # the formats for a file dialog, e.g. "CSV Files (*.csv);;JSON Lines (*.jsonl);;..."
+    return ";;".join(f"{format.name} ({' '.join('*' + extension for extension in format.extensions)})" for format in FORMATS)
+
+def extension_for(file_filter): # the first extension of a file_filters() entry, for names typed without one
+    for format in FORMATS:
+        if file_filter.startswith(format.name + " ("):
+            return format.extensions[0]
+    return '.csv'
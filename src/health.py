@@ -0,0 +1,57 @@
+import time
+from PySide6.QtCore import QObject, QTimer, Signal
+
+class HealthMonitor(QObject): # probes the server in the background, backing off while it's down
+    status_changed = Signal(bool)  # only sent when the server goes from up to down or back
+
+    def __init__(self, api, executor, interval_ms=10000, max_interval_ms=300000, parent=None):
+        super().__init__(parent)
+        self.api = api
+        self.executor = executor
+        self.interval_ms = interval_ms
+        self.max_interval_ms = max_interval_ms  # longest wait between probes while the server is down
+        self.status = None  # None until the first probe comes back
+        self.failures = 0
+        self.in_flight = False
+        self.generation = 0  # bumped when the server changes so late answers from the old one are ignored
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.probe)
+
+    def start(self):
+        self.timer.start(self.interval_ms)
+
+    def stop(self):
+        self.timer.stop()
+        self.generation += 1
+
+    def check_now(self): # forgets what it knew and probes straight away, e.g. after the server URL changed
+        self.stop()
+        self.status = None
+        self.failures = 0
+        self.in_flight = False
+        self.probe()
+
+    def probe(self):
+        if not self.api.base_url or self.in_flight:
+            self.timer.start(self.interval_ms)
+            return
+        if self.status and time.monotonic() - self.api.last_success < self.interval_ms / 1000:
+            self.timer.start(self.interval_ms)  # real traffic has just shown the server is up
+            return
+        self.in_flight = True
+        generation = self.generation
+        self.executor.submit(self.api.check_connection,
+                             on_result=lambda is_connected: self.probed(generation, is_connected),
+                             on_error=lambda message: self.probed(generation, False))
+
+    def probed(self, generation, is_connected):
+        if generation != self.generation:
+            return
+        self.in_flight = False
+        self.api.is_connected = is_connected
+        self.failures = 0 if is_connected else self.failures + 1
+        if is_connected != self.status:
+            self.status = is_connected
+            self.status_changed.emit(is_connected)
+        self.timer.start(min(self.interval_ms * 2 ** self.failures, self.max_interval_ms))
@@ -0,0 +1,57 @@
+import json
+import sqlite3
+import threading
+import time
+
+class Journal: # durable queue of writes the server hasn't confirmed yet, kept per server and sent in the order they were made
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")  # appends don't rewrite the file, and survive a crash
+            self.db.execute("CREATE TABLE IF NOT EXISTS writes (seq INTEGER PRIMARY KEY AUTOINCREMENT, server TEXT, "
+                            "method TEXT, id TEXT, body TEXT, queued REAL, attempts INTEGER DEFAULT 0, error TEXT)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS writes_by_id ON writes (server, id)")
+
+    def append(self, server, method, items): # items are records for POST and PUT, ids for DELETE
+        now = time.time()
+        with self.lock, self.db:
+            for item in items:
+                id, body = (item, None) if method == 'DELETE' else (item["id"], json.dumps(item))
+                if method == 'PUT':  # a newer version of a record that's still waiting replaces it, it's a whole record
+                    last = self.db.execute("SELECT seq, method FROM writes WHERE server = ? AND id = ? ORDER BY seq DESC LIMIT 1",
+                                           (server, id)).fetchone()
+                    if last and last[1] in ('POST', 'PUT'):
+                        self.db.execute("UPDATE writes SET body = ? WHERE seq = ?", (body, last[0]))
+                        continue
+                self.db.execute("INSERT INTO writes (server, method, id, body, queued) VALUES (?, ?, ?, ?, ?)",
+                                (server, method, id, body, now))
+
+    def pending(self, server, after=0, limit=2000): # [(seq, method, id, record or id)] oldest first
+        with self.lock:
+            rows = self.db.execute("SELECT seq, method, id, body FROM writes WHERE server = ? AND seq > ? ORDER BY seq LIMIT ?",
+                                   (server, after, limit)).fetchall()
+        return [(seq, method, id, id if body is None else json.loads(body)) for seq, method, id, body in rows]
+
+    def remove(self, writes): # writes from pending() the server took, unless append() put a newer record into one since
+        # the body has to match what was read, json.dumps gives back the same text for what json.loads made of it
+        with self.lock, self.db:
+            self.db.executemany("DELETE FROM writes WHERE seq = ? AND body IS ?",
+                                [(seq, None if method == 'DELETE' else json.dumps(item)) for seq, method, _, item in writes])
+
+    def retry(self, failed, max_attempts=3): # failed maps seq -> reason, returns [(method, id, reason)] given up on
+        with self.lock, self.db:
+            self.db.executemany("UPDATE writes SET attempts = attempts + 1, error = ? WHERE seq = ?",
+                                [(reason, seq) for seq, reason in failed.items()])
+            dropped = [row for seq in failed for row in self.db.execute(
+                "SELECT seq, method, id, error FROM writes WHERE seq = ? AND attempts >= ?", (seq, max_attempts))]
+            self.db.executemany("DELETE FROM writes WHERE seq = ?", [(row[0],) for row in dropped])
+        return [(method, id, error) for _, method, id, error in dropped]
+
+    def depth(self, server): # writes waiting for that server
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM writes WHERE server = ?", (server,)).fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
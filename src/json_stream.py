@@ -0,0 +1,79 @@
+import codecs
+import json
+
+decoder = json.JSONDecoder()
+WHITESPACE = ' \t\n\r'
+
+class JSONStream: # pulls complete JSON values out of a stream of byte chunks without holding the whole body
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decode = codecs.getincrementaldecoder('utf-8')().decode
+        self.text = ''
+        self.pos = 0
+        self.done = False
+
+    def fill(self): # appends the next chunk to what's left unread, returns False at the end of the stream
+        if self.done:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.done = True
+            tail = self.decode(b'', True)
+        else:
+            tail = self.decode(chunk)
+        self.text = self.text[self.pos:] + tail
+        self.pos = 0
+        return True
+
+    def peek(self): # next non-whitespace character, '' at the end of the stream
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def take(self, allowed): # consumes the next character, which has to be one of allowed
+        char = self.peek()
+        if not char or char not in allowed:
+            raise ValueError(f"Unexpected {char or 'end of data'!r} in JSON response, expected one of {allowed!r}")
+        self.pos += 1
+        return char
+
+    def value(self): # decodes the next whole value, reading more of the stream until it's complete
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            if end == len(self.text) and not self.done:  # a number at the end of a chunk may continue in the next one
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+def iter_array(chunks, key, meta): # yields the items of the top-level `key` array one by one, other top-level keys go into meta
+    stream = JSONStream(chunks)
+    stream.take('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        name = stream.value()
+        stream.take(':')
+        if name == key and stream.peek() == '[':
+            stream.take('[')
+            if stream.peek() == ']':
+                stream.take(']')
+            else:
+                while True:
+                    yield stream.value()
+                    if stream.take(',]') == ']':
+                        break
+        else:
+            meta[name] = stream.value()
+        if stream.take(',}') == '}':
+            return
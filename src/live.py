@@ -0,0 +1,104 @@
+import json
+import logging
+from PySide6.QtCore import QObject, QTimer, Signal
+
+logger = logging.getLogger(__name__)
+
+def iter_lines(response): # a streamed body's lines as soon as each one arrives, response.iter_lines() waits for whole chunks
+    read = getattr(response.raw, 'read1', None)  # urllib3 2.x, older versions get a byte at a time
+    chunks = iter(lambda: read(65536) or b'', b'') if read else response.iter_content(chunk_size=1)
+    buffer = b''
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line.rstrip(b'\r').decode('utf-8', 'replace')
+    if buffer:
+        yield buffer.decode('utf-8', 'replace')
+
+def iter_events(lines): # turns Server-Sent Events lines into (event, data, id) tuples
+    event, data, id = 'message', [], None
+    for line in lines:
+        if not line:  # a blank line ends the event
+            if data:
+                yield event, "\n".join(data), id
+            event, data = 'message', []
+            continue
+        if line.startswith(':'):  # comment, servers send these as keep-alives
+            continue
+        field, _, value = line.partition(':')
+        value = value[1:] if value.startswith(' ') else value
+        if field == 'event':
+            event = value
+        elif field == 'data':
+            data.append(value)
+        elif field == 'id':
+            id = value
+
+def decode_event(kind, data): # the (type, record) of one event, None for anything that isn't an employee event
+    if kind not in ('created', 'updated', 'deleted'):
+        return None
+    try:
+        record = json.loads(data)
+    except ValueError:
+        logger.warning("Ignoring live %s event with bad JSON", kind)
+        return None
+    return (kind, record) if isinstance(record, dict) else None
+
+class LiveUpdates(QObject): # applies employee events pushed by the server, a batch at a time
+    status = Signal(str)
+
+    def __init__(self, api, executor, pager, view, interval_ms=250, parent=None):
+        super().__init__(parent)
+        self.api = api
+        self.executor = executor
+        self.pager = pager
+        self.view = view
+        self.worker = None
+        self.pending = {}  # employee id -> latest record, None once deleted
+        self.timer = QTimer(self)  # events arriving within interval_ms of each other cause one repaint
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def start(self):
+        self.stop()
+        self.worker = self.executor.submit(self.api.listen_events, on_progress=self.received, on_result=self.ended)
+        self.status.emit("Listening for live updates")
+
+    def stop(self):
+        if self.worker:
+            self.worker.cancel()
+            self.worker = None
+            self.api.close_events()  # unblocks the read the worker is waiting in
+        self.pending = {}
+        self.timer.stop()
+
+    def received(self, event): # (type, record) from the listening thread
+        if event is None:
+            return
+        kind, record = event
+        id = str(record.get('id', ''))
+        if not id:
+            return
+        self.pending[id] = None if kind == 'deleted' else record
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def ended(self, reason):
+        self.worker = None
+        if reason:
+            self.status.emit(f"Live updates stopped: {reason}")
+
+    def flush(self):
+        if not self.pending:
+            return
+        records = [record for record in self.pending.values() if record is not None]
+        deleted = [id for id, record in self.pending.items() if record is None]
+        self.pending = {}
+        self.view.setUpdatesEnabled(False)
+        try:
+            self.pager.apply(records, deleted, 'live events')
+        finally:
+            self.view.setUpdatesEnabled(True)
+        logger.debug("Applied %d live updates and %d deletes", len(records), len(deleted))
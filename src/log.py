@@ -0,0 +1,32 @@
+import logging
+from logging.handlers import RotatingFileHandler
+
+FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+class Payload: # defers turning a request/response body into text until a log record is actually written
+    def __init__(self, value, limit=500):
+        self.value = value  # the body itself, or a callable returning it
+        self.limit = limit
+
+    def __str__(self):
+        value = self.value() if callable(self.value) else self.value
+        text = value if isinstance(value, str) else repr(value)
+        if len(text) > self.limit:
+            return f"{text[:self.limit]}... ({len(text)} chars)"
+        return text
+
+def setup_logging(level='INFO', log_file=None, max_bytes=5 * 1024 * 1024, backups=3): # console logging plus an optional rotating file
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(FORMAT))
+    root.addHandler(console)
+    if log_file:
+        file = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+        file.setFormatter(logging.Formatter(FORMAT))
+        root.addHandler(file)
+
+    logging.getLogger('urllib3').setLevel(logging.WARNING)  # one line per pooled connection is too chatty
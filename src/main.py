@@ -2,12 +2,41 @@ import sys
 import qdarkstyle
 import requests
 import json
-from PySide6.QtWidgets import QApplication, QMainWindow, QTableWidget, QTableWidgetItem, QMessageBox, QDialog, QFileDialog
-from PySide6.QtCore import QSettings, QTimer
+import logging
+from PySide6.QtWidgets import QApplication, QMainWindow, QAbstractItemView, QMessageBox, QDialog, QFileDialog, QProgressDialog, QLabel
+from PySide6.QtCore import QSettings, QTimer, Qt, QItemSelectionModel
 from main_ui import Ui_MainWindow as main_ui
 from about_ui import Ui_Dialog as about_ui
+from workers import RequestExecutor
+from table_model import EmployeeTableModel, ColumnSizer
+from filtering import FilterSortModel, FilterBar
+from search import SearchIndex
+from bulk_import import BulkImport
+from export import EmployeeExport
+from formats import file_filters, extension_for
+from snapshot import save_snapshot, load_snapshot
+from journal import Journal
+from paging import PageLoader
+from json_stream import iter_array
+from log import Payload, setup_logging
+from metrics import Metrics
+from stats_panel import StatsPanel
+from health import HealthMonitor
+from cache import ResponseCache, LookupCache
+from live import LiveUpdates, iter_lines, iter_events, decode_event
 import uuid
-import csv
+import time
+import os
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError, ProtocolError, ReadTimeoutError
+
+logger = logging.getLogger(__name__)
+
+UNANSWERED = "no answer from the server, it may have gone through"  # reason for writes that may or may not have been applied
 
 class MainWindow(QMainWindow, main_ui): # used to display the main user interface
     def __init__(self):
@@ -16,19 +45,73 @@ class MainWindow(QMainWindow, main_ui): # used to display the main user interfac
         self.settings = QSettings('settings.ini', QSettings.IniFormat)
         self.settings_manager = SettingsManager(self)  # Initializes SettingsManager
         self.settings_manager.load_settings()  # Load settings when the app starts
-        self.api = API() # initialize FlaskAPI class
+        self.api = API(pool_size=int(self.settings.value('pool_size', 10)), # initialize FlaskAPI class
+                       connect_timeout=float(self.settings.value('connect_timeout', 3.05)),
+                       read_timeout=float(self.settings.value('read_timeout', 30)),
+                       batch_size=int(self.settings.value('batch_size', 500)),
+                       health_path=self.settings.value('health_path', ''),
+                       probe_timeout=float(self.settings.value('probe_timeout', 2)),
+                       lookup_size=int(self.settings.value('lookup_cache_size', 256)),
+                       lookup_ttl=float(self.settings.value('lookup_cache_ttl', 60)))
+        if self.settings.value('cache_enabled', 'true') == 'true': # GET responses are kept in cache.sqlite next to settings.ini
+            self.api.cache = ResponseCache(os.path.join(os.path.dirname(os.path.abspath(self.settings.fileName())), 'cache.sqlite'),
+                                           ttl=float(self.settings.value('cache_ttl_hours', 24)) * 3600,
+                                           max_bytes=int(self.settings.value('cache_max_mb', 256)) * 1024 * 1024)
+        if self.settings.value('journal_enabled', 'true') == 'true': # writes the server can't take yet wait in journal.sqlite
+            self.api.journal = Journal(os.path.join(os.path.dirname(os.path.abspath(self.settings.fileName())), 'journal.sqlite'))
+        self.executor = RequestExecutor(max_threads=self.api.pool_size, parent=self) # runs API calls off the GUI thread
+        self.replay_worker = None  # sending the journal's writes, if it's running
+        self.replay_offline = None  # whether the last replay stopped because the server went away, None if it didn't finish
+        self.label_queue = QLabel() # how many writes are waiting for the server
+        self.statusbar.addPermanentWidget(self.label_queue)
+        self.importer = None  # the running import, if any
+        self.exporter = None  # the running export, if any
+        self.model = EmployeeTableModel(self) # the table's data lives here, the view only draws it
+        self.search_index = SearchIndex() # words of every loaded employee, follows the model so it's current before the proxy re-filters
+        self.search_index.follow(self.model)
+        self.proxy = FilterSortModel(self.model, self) # what the table shows, the model filtered and sorted by the bar above it
+        self.table.setModel(self.proxy)
+        self.filter_bar = FilterBar(self.proxy, self.table, self.search_index, self)
+        self.verticalLayout_3.insertWidget(self.verticalLayout_3.indexOf(self.table), self.filter_bar)
+        self.table.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.column_sizer = ColumnSizer(self.table) # fits column widths from a sample of rows instead of every row
+        self.pager = PageLoader(self.api, self.executor, self.model, self.table, # loads /getdata a page at a time
+                                page_size=int(self.settings.value('page_size', 1000)),
+                                max_pages=int(self.settings.value('max_pages', 5)))
+        self.pager.status.connect(self.statusbar.showMessage)
+        self.live = LiveUpdates(self.api, self.executor, self.pager, self.table, parent=self) # server-pushed changes, off unless live_updates is set
+        self.live.status.connect(self.statusbar.showMessage)
+        self.api.events_path = self.settings.value('events_path', '/events')
+
+        # the rows loaded last time are saved in snapshot.bin next to settings.ini on close and shown again on start
+        self.snapshot_path = None
+        self.restored_server = None  # the server the snapshot on screen came from, until it's been synced with
+        if self.settings.value('snapshot_enabled', 'true') == 'true':
+            self.snapshot_path = os.path.join(os.path.dirname(os.path.abspath(self.settings.fileName())), 'snapshot.bin')
+            self.restore_snapshot()
+
+        # request stats, docked at the bottom and toggled from the Settings menu
+        self.stats_panel = StatsPanel(self.api.metrics, self, lookups=self.api.lookups)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.stats_panel)
+        self.stats_panel.hide()
+        self.menuSettings.addAction(self.stats_panel.toggleViewAction())
 
         # Connect line_server to the update_base_url method
         self.line_server.returnPressed.connect(self.update_base_url)       
+        self.line_employee_id.returnPressed.connect(self.jump_to_employee)
 
         # Update label_connection based on connection status
         self.label_connection.setText("Not Connected to FastAPI")
-        #self.update_connection_status()
 
-        # Set up a timer to poll the connection status every 30 seconds
-        self.connection_timer = QTimer(self)
-        self.connection_timer.timeout.connect(self.update_connection_status)
-        self.connection_timer.start(10000)  # 10 seconds in milliseconds
+        # Probe the server in the background every 10 seconds, backing off while it's down
+        self.health = HealthMonitor(self.api, self.executor, interval_ms=int(self.settings.value('health_interval_ms', 10000)),
+                                    max_interval_ms=int(self.settings.value('health_max_interval_ms', 300000)), parent=self)
+        self.health.status_changed.connect(self.update_connection_status)
+        self.health.start()
+
+        # reconnect to the last server straight away, cached rows show up while the server is asked for changes
+        if self.line_server.text():
+            QTimer.singleShot(0, self.update_base_url)
 
         # button
         self.button_post.clicked.connect(self.api_post)
@@ -71,14 +154,24 @@ class MainWindow(QMainWindow, main_ui): # used to display the main user interfac
         new_url = f"http://{self.line_server.text()}"
 
         self.api.base_url = new_url
-        print(f"API base URL updated to: {self.api.base_url}")
+        logger.info("API base URL updated to: %s", self.api.base_url)
+
+        # results still coming back from the old server are no longer wanted
+        self.executor.cancel_all()
+        restored = new_url == self.restored_server  # the snapshot's rows stay and only what changed is fetched
+        self.restored_server = None
+        if not restored:
+            self.pager.stop()
 
         # check the connection if base_url is set
+        self.show_queue_depth()
         if self.api.base_url:
-            self.api.is_connected = self.api.check_connection()
-            self.update_connection_status()
-            self.initialize_table()
+            self.health.check_now()
+            if not restored:
+                self.initialize_table()
             self.api_get()
+            if self.settings.value('live_updates', 'false') == 'true':
+                self.live.start()
 
     def api_post(self): # uploads data (Post Button Pressed)
 
@@ -95,21 +188,31 @@ class MainWindow(QMainWindow, main_ui): # used to display the main user interfac
         country = self.line_country.text()
         misc = self.line_misc.text()
 
-        row = self.table.rowCount()
+        row = self.model.rowCount()
         self.populate_table(row, id, first_name, middle_name, last_name, age, title, address1, address2, country, misc)
 
         # Prepare the data in the format required by the API
         data = self.employee_data(id, first_name, middle_name, last_name, age, title, address1, address2, country, misc)
 
-        # Send the data using FlaskAPI's send_post method
-        response = self.api.send_post(data)
-        if response:
-            print("Data sent successfully:", response)
-        else:
-            print("Failed to send data.")
+        # Send the data in the background, it waits in the journal if the server can't be reached
+        self.executor.submit(self.api.write_many, 'POST', [data], offline=self.health.status is False,
+                             on_result=self.post_finished)
 
         self.clear_fields()
 
+    def post_finished(self, result):
+        done, failed, queued = result
+        if done:
+            logger.info("Employee %s added", done[0])
+        elif queued:
+            self.writes_queued(queued)
+        elif failed:
+            id, reason = next(iter(failed.items()))
+            logger.warning("Failed to send data: %s", reason)
+            if reason == UNANSWERED:  # not queued, sending it again could add the employee twice
+                QMessageBox.warning(self, "Error", f"The server didn't answer, employee {id} may or may not have been added. "
+                                                   "Get the data to check before posting it again.")
+
     def api_get(self): # queries the data (Get Button Pressed)
         # Fetch the employee_id from the QLineEdit
         id = self.line_employee_id.text()
@@ -119,82 +222,82 @@ class MainWindow(QMainWindow, main_ui): # used to display the main user interfac
         if id:
             params = {'id': id}  # Add employee_id to query parameters if present
 
-        # Call the send_get method from API class
-        data = self.api.send_get(params)  # Pass params to send_get method
+        if not params:  # the full list is fetched a page at a time as the user scrolls
+            if self.pager.watermark is not None:
+                self.pager.sync()  # only what changed since the last load, patched into the table
+            else:
+                self.pager.start()
+            return
 
+        # Call the send_get method from API class in the background
+        self.pager.stop()
+        self.executor.submit(self.api.send_get, params, on_result=self.get_finished)  # Pass params to send_get method
+
+    def get_finished(self, data):
         if data:
-            print("Data received from API:", data)  # Log the received data
+            logger.debug("Data received from API: %s", Payload(data))  # Log the received data
 
             # Check if the data contains the 'employees' key
             if "employees" in data:
-                employees = data["employees"]  # Get the list of employees
-                
-                # Initialize the table to ensure it is cleared before populating new data
-                self.initialize_table()
-
-                # Iterate over the employees data and populate the table
-                for record in employees:
-                    if isinstance(record, dict):
-                        # Extract values for each record
-                        id = record.get("id")
-                        first_name = record.get("name", {}).get("first_name", "")
-                        middle_name = record.get("name", {}).get("middle_name", "")
-                        last_name = record.get("name", {}).get("last_name", "")
-                        age = record.get("age")
-                        title = record.get("title")
-                        address1 = record.get("address", {}).get("address_1", "")
-                        address2 = record.get("address", {}).get("address_2", "")
-                        country = record.get("address", {}).get("country", "")
-                        misc = record.get("misc")
-
-                        # Find the next available row in the table
-                        row = self.table.rowCount()
-
-                        # Populate the table with the values
-                        self.populate_table(row, id, first_name, middle_name, last_name, age, title, address1, address2, country, misc)
+                # Replace the table contents with the employees in one go
+                with self.column_sizer.batch(), self.api.metrics.timer('GET /getdata', 'fill'):
+                    self.model.set_records(data["employees"])
             else:
-                print("Unexpected data format: Missing 'Employees' key")
+                logger.warning("Unexpected data format: Missing 'Employees' key")
         else:
-            print("Failed to retrieve data.")
+            logger.warning("Failed to retrieve data.")
+
+    def jump_to_employee(self): # selects the employee if it's already loaded, otherwise asks the server for it
+        id = self.line_employee_id.text().strip()
+        row = self.model.row_of(id)
+        if row == -1:
+            self.api_get()
+            return
+        index = self.proxy.mapFromSource(self.model.index(row, 0))
+        if not index.isValid():  # filtered out, show everything again
+            self.filter_bar.clear()
+            index = self.proxy.mapFromSource(self.model.index(row, 0))
+        self.table.setCurrentIndex(index)
+        self.table.selectionModel().select(index, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+        self.table.scrollTo(index, QAbstractItemView.PositionAtCenter)
 
     def api_put(self): # update data (Put Button Pressed)
-        selected_row = self.table.currentRow()
+        # every selected row is sent, falling back to the current row when nothing is selected
+        rows = sorted({index.row() for index in self.table.selectedIndexes()})
+        if not rows and self.table.currentIndex().row() != -1:
+            rows = [self.table.currentIndex().row()]
         
-        if selected_row == -1:  # No row selected
+        if not rows:  # No row selected
             QMessageBox.warning(self, "Error", "Please select a row to update.")
             return
 
-        # Extract updated data from the table's cells
-        id = self.table.item(selected_row, 0).text()
-        first_name = self.table.item(selected_row, 1).text()
-        middle_name = self.table.item(selected_row, 2).text()
-        last_name = self.table.item(selected_row, 3).text()
-        age = self.table.item(selected_row, 4).text()
-        title = self.table.item(selected_row, 5).text()
-        address1 = self.table.item(selected_row, 6).text()
-        address2 = self.table.item(selected_row, 7).text()
-        country = self.table.item(selected_row, 8).text()
-        misc = self.table.item(selected_row, 9).text()
-
-        # Prepare the data to be sent in the PUT request
-        data = self.employee_data(id, first_name, middle_name, last_name, age, title, address1, address2, country, misc)
+        # Extract updated data from the table's cells and prepare the data to be sent in the PUT request
+        try:
+            records = [self.employee_data(*self.model.row_values(self.proxy.source_row(row))) for row in rows]
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", f"Invalid employee data: {e}")
+            return
 
         # Debugging output
-        print(f"Data to be sent in PUT request: {data}")
+        logger.info("Sending %d employee(s) in PUT request", len(records))
 
-        response = self.api.send_put(data)
-        
-        # Debugging response
-        print(f"Response from PUT request: {response}")
+        ids = [record["id"] for record in records]
+        self.executor.submit(self.api.write_many, 'PUT', records, self.api.pool_size, offline=self.health.status is False,
+                             on_result=lambda result: self.put_finished(ids, result))
 
-        if response:
-            print("Data updated successfully:", response)
-            QMessageBox.information(self, "Success", "Employee data updated successfully.")
+    def put_finished(self, ids, result):
+        done, failed, queued = result
+        if queued:
+            self.writes_queued(queued)
+        if not failed and not done:
+            return
+        if not failed:
+            logger.info("Updated %d employee(s) successfully", len(done))
+            QMessageBox.information(self, "Success", f"Employee data updated successfully ({len(done)} employee(s)).")
         else:
-            print("Failed to update data.")
-            QMessageBox.warning(self, "Error", "Failed to update employee data.")
-        self.table.resizeColumnsToContents()
-        self.table.resizeRowsToContents()
+            logger.warning("Failed to update %d of %d employee(s).", len(failed), len(ids))
+            listed = "\n".join(list(failed)[:20])
+            QMessageBox.warning(self, "Error", f"Failed to update {len(failed)} of {len(ids)} employee(s):\n{listed}")
 
     def api_delete(self): # delete data (Delete Button Pressed)
         # Get the selected rows from the table
@@ -213,40 +316,29 @@ class MainWindow(QMainWindow, main_ui): # used to display the main user interfac
                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            # Iterate over the rows and delete each
-            for row in sorted(rows_to_delete, reverse=True):  # Sort rows in descending order to avoid index shift
-                id = self.table.item(row, 0).text()  # Extract the ID of the employee
+            ids = [self.model.row_values(self.proxy.source_row(row))[0] for row in rows_to_delete]  # Extract the IDs of the employees
 
-                # Send DELETE request using FlaskAPI's send_delete method
-                response = self.api.send_delete(id)
+            # Send the DELETE requests in the background, the table is updated once when they're all back
+            self.executor.submit(self.api.write_many, 'DELETE', ids,
+                                 concurrency=int(self.settings.value('delete_concurrency', self.api.pool_size)),
+                                 offline=self.health.status is False, on_result=self.delete_finished)
 
-                if response:
-                    print(f"Employee with ID {id} deleted successfully:", response)
-                    self.table.removeRow(row)  # Remove the row from the table
-                else:
-                    print(f"Failed to delete employee with ID {id}.")
-                    QMessageBox.warning(self, "Error", f"Failed to delete employee with ID {id}.")
+    def delete_finished(self, result):
+        deleted, failed, queued = result
+        logger.info("Deleted %d employees, %d failed, %d queued", len(deleted), len(failed), len(queued))
+        self.pager.remove_ids(deleted + queued)  # Remove the rows from the table, queued deletes will happen on reconnect
+        if queued:
+            self.writes_queued(queued)
+        if failed:
+            listed = "\n".join(f"{id}: {reason}" for id, reason in list(failed.items())[:20])
+            more = f"\n...and {len(failed) - 20} more" if len(failed) > 20 else ""
+            QMessageBox.warning(self, "Error", f"Failed to delete {len(failed)} employee(s):\n{listed}{more}")
 
     def initialize_table(self):
-        self.table.setRowCount(0) # clears the table
-        self.table.setColumnCount(10)
-        self.table.setHorizontalHeaderLabels(['ID', 'First Name', 'Middle Name', 'Last Name', 'Age', 'Title', 'Address 1', 'Address 2', 'Country', 'Misc'])
-        self.table.setSelectionMode(QTableWidget.MultiSelection)
+        self.model.clear() # clears the table
 
     def populate_table(self, row, id, first_name, middle_name, last_name, age, title, address1, address2, country, misc):
-        self.table.insertRow(row)
-        self.table.setItem(row, 0, QTableWidgetItem(id))
-        self.table.setItem(row, 1, QTableWidgetItem(first_name))
-        self.table.setItem(row, 2, QTableWidgetItem(middle_name))
-        self.table.setItem(row, 3, QTableWidgetItem(last_name))
-        self.table.setItem(row, 4, QTableWidgetItem(str(age)))
-        self.table.setItem(row, 5, QTableWidgetItem(title))
-        self.table.setItem(row, 6, QTableWidgetItem(address1))
-        self.table.setItem(row, 7, QTableWidgetItem(address2))
-        self.table.setItem(row, 8, QTableWidgetItem(country))
-        self.table.setItem(row, 9, QTableWidgetItem(misc))
-        self.table.resizeColumnsToContents()
-        self.table.resizeRowsToContents()
+        self.pager.insert_row(row, (id, first_name, middle_name, last_name, age, title, address1, address2, country, misc))
 
     def clear_fields(self):
         self.line_firstname.clear()
@@ -259,139 +351,297 @@ class MainWindow(QMainWindow, main_ui): # used to display the main user interfac
         self.line_country.clear()
         self.line_misc.clear()
 
-    def import_csv(self):  # imports data from a CSV file
-        # Open file dialog to select CSV file
-        filename, _ = QFileDialog.getOpenFileName(self, 'Import File', '', 'CSV Files (*.csv)')
+    def import_csv(self):  # imports data from a CSV, JSON Lines, Parquet or Arrow file
+        # Open file dialog to select the file
+        filename, _ = QFileDialog.getOpenFileName(self, 'Import File', '', file_filters())
         
         if not filename:
             return
-        
-        try:
-            with open(filename, 'r', newline='') as file:
-                reader = csv.DictReader(file)
-                
-                # Verify required columns are present
-                required_columns = {'ID', 'First Name', 'Middle Name', 'Last Name', 'Age', 
-                                'Title', 'Address 1', 'Address 2', 'Country', 'Misc'}
-                if not required_columns.issubset(reader.fieldnames):
-                    QMessageBox.critical(self, "Import Error", 
-                                    "CSV file is missing required columns")
-                    return
-                
-                # Get existing IDs from the table
-                existing_ids = set()
-                for row in range(self.table.rowCount()):
-                    id_item = self.table.item(row, 0)  # ID is in column 0
-                    if id_item:
-                        existing_ids.add(id_item.text())
-                
-                imported_count = 0
-                
-                # Process each row in the CSV
-                for row in reader:
-                    # Check if ID is present and valid, otherwise generate a new one
-                    id = row['ID'].strip()
-                    if not id:  # If ID is blank or empty
-                        id = str(uuid.uuid4())
-                    
-                    # Skip if ID already exists in table
-                    if id in existing_ids:
-                        print(f"Skipping existing employee {id}")
-                        continue
-                    
-                    # Extract data from the row
-                    first_name = row['First Name']
-                    middle_name = row['Middle Name']
-                    last_name = row['Last Name']
-                    age = row['Age']
-                    title = row['Title']
-                    address1 = row['Address 1']
-                    address2 = row['Address 2']
-                    country = row['Country']
-                    misc = row['Misc']
-                    
-                    # Add to table
-                    row = self.table.rowCount()
-                    self.populate_table(row, id, first_name, middle_name, 
-                                    last_name, age, title, address1, address2, country, misc)
-                    
-                    # Prepare data for API POST
-                    data = self.employee_data(id, first_name, middle_name, last_name, 
-                                        age, title, address1, address2, country, misc)
-                    
-                    # Send to API
-                    response = self.api.send_post(data)
-                    if response:
-                        print(f"Imported employee {id} successfully")
-                        imported_count += 1
-                    else:
-                        print(f"Failed to import employee {id}")
-                
-                if imported_count > 0:
-                    QMessageBox.information(self, "Import Successful", 
-                                        f"Successfully imported {imported_count} new employees from {filename}")
-                else:
-                    QMessageBox.information(self, "Import Complete", 
-                                        "No new employees were imported - all IDs already exist")
-                    
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import CSV: {str(e)}")
-
-    def export_to_csv(self): # exports data to a CSV file
-        self.filename = QFileDialog.getSaveFileName(self, 'Export File', '', 'Data File (*.csv)')
+
+        # the file is read and posted on a worker thread, rows the server accepts are added to the table as they come back
+        self.importer = BulkImport(self.api, filename, self.employee_data, lambda id: self.model.row_of(id) != -1,
+                                   concurrency=int(self.settings.value('import_concurrency', self.api.pool_size)),
+                                   stream_threshold=int(self.settings.value('stream_import_mb', 64)) * 1024 * 1024,
+                                   display_rows=int(self.settings.value('import_display_rows', 10000)))
+        self.import_progress = QProgressDialog("Importing employees...", "Cancel", 0, 1000, self)
+        self.import_progress.setWindowTitle("Import")
+        self.import_progress.setWindowModality(Qt.WindowModal)
+        self.import_progress.setMinimumDuration(0)
+        self.import_progress.canceled.connect(self.importer.cancel)
+        self.importer.progress.connect(self.import_progressed)
+        self.importer.rows_imported.connect(self.import_rows)
+        self.importer.finished.connect(self.import_finished)
+        self.executor.submit(self.importer.run, on_error=self.import_failed)
+
+    def import_rows(self, rows):
+        with self.api.metrics.timer('CSV import', 'fill'):
+            self.pager.append_rows(rows)
+
+    def import_progressed(self, read, imported, failed, rate):
+        self.import_progress.setValue(read)
+        self.import_progress.setLabelText(f"Imported {imported} employees, {failed} failed ({rate:.0f} rows/sec)")
+
+    def import_failed(self, message):
+        self.import_progress.reset()
+        QMessageBox.critical(self, "Import Error", f"Failed to import: {message}")
+
+    def import_finished(self, summary):
+        self.import_progress.reset()
+        if summary['error']:
+            QMessageBox.critical(self, "Import Error", summary['error'])
+            return
+
+        title = "Import Cancelled" if summary['cancelled'] else "Import Complete"
+        message = (f"Imported {summary['imported']} new employees from {summary['filename']} "
+                   f"in {summary['seconds']:.1f} s, skipped {summary['skipped']} existing IDs.")
+        if summary['streaming'] and summary['displayed'] < summary['imported']:
+            message += f"\nThe file was streamed, only the first {summary['displayed']} imported rows are shown."
+        if summary['unchecked']:
+            message += (f"\n{summary['unchecked']} rows came too far into the file to be checked for IDs repeated "
+                        "within it, a repeat among them was sent again.")
+        if summary['failed']:
+            message += (f"\n\n{summary['failed']} rows failed and were saved to {summary['failed_file']}"
+                        " - import that file to retry them.")
+            for id, reason in summary['failed_samples']:
+                logger.warning("Failed to import employee %s: %s", id, reason)
+        QMessageBox.information(self, title, message)
+
+    def export_to_csv(self): # exports data to a CSV, JSON Lines, Parquet or Arrow file
+        self.filename = QFileDialog.getSaveFileName(self, 'Export File', '', file_filters())
 
         if not self.filename[0]:
             return
+        filename = self.filename[0]
+        if not os.path.splitext(filename)[1]:  # typed without an extension, use the chosen format's
+            filename += extension_for(self.filename[1])
 
-        try:
-            with open(self.filename[0], 'w', newline='') as file:
-                writer = csv.writer(file)
-                
-                # Write the header row (column names from the table)
-                headers = [self.table.horizontalHeaderItem(col).text() for col in range(self.table.columnCount())]
-                writer.writerow(headers)
-
-                # Write the data rows from the table
-                for row in range(self.table.rowCount()):
-                    row_data = []
-                    for col in range(self.table.columnCount()):
-                        item = self.table.item(row, col)
-                        # Append the text if the item exists, otherwise append an empty string
-                        row_data.append(item.text() if item else '')
-                    writer.writerow(row_data)
-
-            QMessageBox.information(self, "Export Successful", f"Table data exported to {self.filename[0]}")
-        
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", f"Failed to export to CSV: {str(e)}")
+        from_server = False
+        if self.api.base_url:  # with a server there's the choice of exporting everything it has, not just what's loaded
+            box = QMessageBox(QMessageBox.Question, "Export",
+                              "Export the employees shown in the table, or every employee on the server?", parent=self)
+            button_table = box.addButton("Shown in table", QMessageBox.AcceptRole)
+            button_server = box.addButton("Everything on server", QMessageBox.AcceptRole)
+            box.addButton(QMessageBox.Cancel)
+            box.exec()
+            if box.clickedButton() not in (button_table, button_server):
+                return
+            from_server = box.clickedButton() == button_server
+        self.start_export(filename, from_server)
 
-    def update_connection_status(self):
-        self.api.is_connected = self.api.check_connection()
-        if self.api.is_connected:
+    def start_export(self, filename, from_server=False): # writes the file on a worker thread with a progress dialog
+        self.exporter = EmployeeExport(filename)
+        if from_server:
+            self.exporter.from_server(self.api, self.pager.params, page_size=int(self.settings.value('export_page_size', 5000)))
+        else:
+            self.exporter.from_table(self.model.columns, self.proxy.rows)
+        self.export_progress = QProgressDialog("Exporting employees...", "Cancel", 0, 0, self)
+        self.export_progress.setWindowTitle("Export")
+        self.export_progress.setWindowModality(Qt.WindowModal)
+        self.export_progress.setMinimumDuration(500)
+        self.export_progress.canceled.connect(self.exporter.cancel)
+        self.exporter.progress.connect(self.export_progressed)
+        self.exporter.finished.connect(self.export_finished)
+        self.executor.submit(self.exporter.run, on_error=self.export_failed)
+
+    def export_progressed(self, written, total, rate):
+        if total:  # stays a busy indicator until the server says how many there are
+            self.export_progress.setMaximum(max(total, written))
+            self.export_progress.setValue(written)
+        self.export_progress.setLabelText(f"Exported {written} employees ({rate:.0f} rows/sec)")
+
+    def export_failed(self, message):
+        self.export_progress.reset()
+        QMessageBox.critical(self, "Export Error", f"Failed to export: {message}")
+
+    def export_finished(self, summary):
+        self.export_progress.reset()
+        if summary['error']:
+            QMessageBox.critical(self, "Export Error", f"Failed to export: {summary['error']}")
+        elif summary['cancelled']:
+            self.statusbar.showMessage("Export cancelled, nothing was written", 5000)
+        else:
+            QMessageBox.information(self, "Export Successful",
+                                    f"Exported {summary['written']} employees to {summary['filename']} in {summary['seconds']:.1f} s")
+
+    def update_connection_status(self, is_connected): # called by the health monitor when the server goes up or down
+        if is_connected:
             self.label_connection.setText("Connected to FastAPI")
+            self.replay_journal()
         else:
             self.label_connection.setText("Failed to connect to FastAPI")
 
+    def writes_queued(self, ids):
+        self.show_queue_depth()
+        if self.health.status is False:
+            self.statusbar.showMessage(f"Server unreachable, {len(ids)} change(s) saved and will be sent when it's back", 5000)
+        else:
+            self.replay_journal()  # queued behind earlier writes, or the server just dropped, try again now
+
+    def show_queue_depth(self, depth=None):
+        if self.api.journal is None:
+            return
+        if depth is None:
+            depth = self.api.journal.depth(self.api.base_url)
+        self.label_queue.setText(f"{depth} change(s) waiting for the server" if depth else "")
+
+    def replay_journal(self): # sends the writes saved while the server couldn't be reached
+        if self.api.journal is None or self.replay_worker is not None or not self.api.journal.depth(self.api.base_url):
+            return
+        self.replay_offline = None
+        self.replay_worker = self.executor.submit(self.api.replay_journal,
+                                                  concurrency=int(self.settings.value('replay_concurrency', self.api.pool_size)),
+                                                  on_progress=self.show_queue_depth, on_result=self.journal_replayed,
+                                                  on_finished=self.replay_stopped)
+
+    def replay_stopped(self):
+        self.replay_worker = None
+        self.show_queue_depth()
+        # writes queued while it ran were skipped by replay_journal above, send them now the server is known to be up
+        if self.replay_offline is False and self.health.status is True and self.api.journal.depth(self.api.base_url):
+            self.replay_journal()
+
+    def journal_replayed(self, summary):
+        self.replay_offline = summary['offline']
+        if summary['sent']:
+            self.statusbar.showMessage(f"Sent {summary['sent']} change(s) saved while offline", 5000)
+        if summary['rejected']:
+            listed = "\n".join(f"{method} {id}: {reason}" for method, id, reason in summary['rejected'][:20])
+            QMessageBox.warning(self, "Error", f"{len(summary['rejected'])} saved change(s) were rejected or went unanswered, "
+                                               f"they were dropped:\n{listed}")
+
     def dark_mode(self, checked):
         if checked:
             self.setStyleSheet(qdarkstyle.load_stylesheet_pyside6())
         else:
             self.setStyleSheet('')
 
+    def restore_snapshot(self): # shows the rows saved on the last close if they came from the server that's set
+        snapshot = load_snapshot(self.snapshot_path)
+        if snapshot is None:
+            return
+        columns, state = snapshot
+        server = f"http://{self.line_server.text()}"
+        if state.get('server') != server or len(columns) != self.model.columnCount():
+            return
+        with self.column_sizer.batch():
+            self.model.set_columns(columns)
+        self.pager.restore(state)
+        self.restored_server = server
+        saved = time.strftime('%Y-%m-%d %H:%M', time.localtime(state['saved_at']))
+        self.statusbar.showMessage(f"Showing {state['rows']} employees saved {saved}, checking the server for changes...")
+
+    def save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        if not self.api.base_url or not self.model.rowCount():
+            if os.path.exists(self.snapshot_path):
+                os.remove(self.snapshot_path)  # an empty table shouldn't bring back an old one next time
+            return
+        try:
+            save_snapshot(self.snapshot_path, self.model.columns, {**self.pager.state(), 'server': self.api.base_url})
+        except OSError as e:
+            logger.warning("Couldn't save the snapshot: %s", e)
+
     def closeEvent(self, event):  # Save settings when closing the app
         self.settings_manager.save_settings()  # Save settings using the manager
+        self.save_snapshot()
+        self.health.stop()
+        self.live.stop()
+        if self.importer:
+            self.importer.cancel()
+        if self.exporter:
+            self.exporter.cancel()  # its .part file is removed, the file it was replacing stays as it was
+        self.executor.shutdown()  # drop pending results and let running requests finish
+        self.api.close()  # release pooled connections
+        if self.api.cache:
+            self.api.cache.close()
+        if self.api.journal:
+            self.api.journal.close()
         event.accept()
 
+def never_sent(error): # whether a failed request never reached the server, so sending it again can't apply it twice
+    reason = getattr(error.args[0], 'reason', None) if error.args else None  # urllib3's MaxRetryError says why
+    return isinstance(error, requests.ConnectTimeout) or isinstance(reason, NewConnectionError)
+
 class API: # Connects to the API
-    def __init__(self):
-        self.base_url = None
+    def __init__(self, pool_size=10, connect_timeout=3.05, read_timeout=30, batch_size=500, health_path='',
+                 probe_timeout=2, lookup_size=256, lookup_ttl=60):
+        self.pool_size = pool_size  # max keep-alive connections kept open per host
+        self.batch_size = batch_size  # most employees sent in one batch request
+        self.timeout = (connect_timeout, read_timeout)  # (connect, read) in seconds
+        self.session = None
+        self._host = None
+        self._base_url = None
         self.is_connected = False
+        self.batch_routes = {}  # batch route -> whether the server accepts it, missing until we've tried it
+        self.metrics = Metrics()  # timings, sizes and status codes of every call, per endpoint
+        self.health_path = health_path  # probed by check_connection, e.g. '/health', '' is the server root
+        self.probe_timeout = probe_timeout
+        self.probe_method = 'HEAD'  # switches to GET if the server doesn't answer HEAD
+        self.last_success = 0.0  # time.monotonic() of the last 2xx response
+        self.cache = None  # optional ResponseCache, GETs are then revalidated instead of downloaded again
+        self.journal = None  # optional Journal, writes that can't reach the server wait in it instead of being lost
+        self.lookups = LookupCache(lookup_size, lookup_ttl)  # recent GET /getdata?id=... results
+        self.events_path = '/events'  # Server-Sent Events stream of employee changes
+        self.events_response = None  # the open event stream, closed from the GUI thread to stop listening
+        self.events_wakeup = threading.Event()  # cuts the wait between reconnects short
+        self.create_session()
+
+    @property
+    def base_url(self):
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, url):
+        self._base_url = url
+        host = urlsplit(url).netloc if url else None
+        if host != self._host or self.session is None:  # new host means the old pool is useless
+            self._host = host
+            self.batch_routes = {}
+            self.probe_method = 'HEAD'
+            self.lookups.clear()
+            self.create_session()
+
+    def create_session(self): # builds a pooled keep-alive session so connections are reused between calls
+        self.close()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def request(self, method, path, endpoint=None, **kwargs): # every call goes through here so it's timed and counted
+        endpoint = endpoint or f"{method} {path or '/'}"
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, f'{self.base_url}{path}', **kwargs)
+        except requests.RequestException:
+            self.metrics.record(endpoint, time.perf_counter() - start, error=True)
+            raise
+        ok = response.status_code // 100 == 2 or response.status_code == 304
+        if ok:
+            self.last_success = time.monotonic()
+        if not kwargs.get('stream'):  # streamed bodies are counted by whoever reads them
+            self.metrics.record(endpoint, time.perf_counter() - start, status=response.status_code,
+                                error=not ok, sent=len(response.request.body or b''),
+                                received=len(response.content), server=response.elapsed.total_seconds())
+        return response
 
     def check_connection(self):
         if not self.base_url:
             return False  # No base_url means we can't connect
         try:
-            response = requests.get(self.base_url)
+            # a HEAD with a short timeout is enough to know the server is there
+            response = self.request(self.probe_method, self.health_path, endpoint='health check', timeout=self.probe_timeout)
+            if response.status_code == 405 and self.probe_method == 'HEAD':  # HEAD isn't allowed on this route
+                self.probe_method = 'GET'
+                response = self.request('GET', self.health_path, endpoint='health check', timeout=self.probe_timeout)
             if response.status_code // 100 == 2:  # checks for any 2xx status code
                 return True
         except requests.RequestException:
@@ -400,77 +650,361 @@ class API: # Connects to the API
     
     def send_post(self, data):
         try:
-            response = requests.post(f'{self.base_url}/postdata', json=data)
+            response = self.request('POST', '/postdata', json=data)
+            self.lookups.invalidate([data["id"]])
             
             if response.status_code // 100 == 2:  # Success: checks for 2xx status codes
-                print("POST request successful:", response.json())
-                return response.json()
+                data = response.json()
+                logger.debug("POST request successful: %s", Payload(data))
+                return data
             else:
-                print(f"POST request failed with status code: {response.status_code}")
+                logger.warning("POST request failed with status code: %s", response.status_code)
                 return None
         except requests.RequestException as e:
-            print(f"POST request error: {e}")
+            logger.error("POST request error: %s", e)
+            return None
+
+    def paging_params(self, params, offset, limit, cursor): # offset/limit or cursor/limit ask the server for one page instead of everything
+        paging = {key: value for key, value in (('offset', offset), ('limit', limit), ('cursor', cursor)) if value is not None}
+        if paging:
+            params = {**(params or {}), **paging}
+        return params
+
+    def cache_lookup(self, params): # (cache key, cached response or None), (None, None) without a cache
+        if self.cache is None:
+            return None, None
+        key = self.cache.key(f'{self.base_url}/getdata', params)
+        return key, self.cache.get(key)
+
+    def cached_get(self, params=None, offset=None, limit=None, cursor=None): # what send_get returned last time, without asking the server
+        key, cached = self.cache_lookup(self.paging_params(params, offset, limit, cursor))
+        if cached is None:
+            return None
+        try:
+            return json.loads(cached.body)
+        except ValueError:
             return None
 
-    def send_get(self, params=None):
+    def send_get(self, params=None, offset=None, limit=None, cursor=None):
+        params = self.paging_params(params, offset, limit, cursor)
+        id = params.get('id') if params and len(params) == 1 else None  # single-employee lookups go through the LRU first
+        if id is not None:
+            data = self.lookups.get(id)
+            if data is not None:
+                return data
+        data = self.fetch_get(params)
+        if id is not None and isinstance(data, dict) and 'employees' in data:
+            self.lookups.put(id, data)
+        return data
+
+    def fetch_get(self, params):
+        key, cached = self.cache_lookup(params)
         try:
             # If params are provided, add them as query parameters to the URL
-            url = f'{self.base_url}/getdata'
-            if params:
-                response = requests.get(url, params=params)  # Use params for query parameters
-            else:
-                response = requests.get(url)
+            response = self.request('GET', '/getdata', params=params or None, headers=cached.validators() if cached else None)
 
+            if response.status_code == 304 and cached:  # unchanged since we cached it
+                self.cache.touch(key)
+                return json.loads(cached.body)
             if response.status_code // 100 == 2:  # Success: checks for 2xx status codes
-                print("GET request successful:", response.text)  # Print the raw response text
+                logger.debug("GET request successful: %s", Payload(lambda: response.text))  # the raw body is only decoded when debugging
 
                 try:
                     # Attempt to parse the JSON response
-                    data = response.json()  # This will automatically parse JSON if it's valid
-                    print("Parsed data:", data)
+                    with self.metrics.timer('GET /getdata', 'decode'):
+                        data = response.json()  # This will automatically parse JSON if it's valid
+                    if key:
+                        self.cache.put(key, response.headers.get('ETag'), response.headers.get('Last-Modified'), response.content)
                     return data
                 except json.JSONDecodeError as e:
-                    print(f"Error parsing JSON: {e}")
+                    logger.error("Error parsing JSON: %s", e)
                     return None
             else:
-                print(f"GET request failed with status code: {response.status_code}")
+                logger.warning("GET request failed with status code: %s", response.status_code)
                 return None
         except requests.RequestException as e:
-            print(f"GET request error: {e}")
+            logger.error("GET request error: %s", e)
             return None
 
+    def send_get_stream(self, params=None, offset=None, limit=None, cursor=None, meta=None):
+        # yields the records in "employees" one at a time as the body arrives, the response's other
+        # top-level keys (total, next_cursor...) end up in meta, and meta['error'] is set if it fails
+        # meta['not_modified'] is set when the records came from the cache after a 304
+        meta = {} if meta is None else meta
+        params = self.paging_params(params, offset, limit, cursor)
+        key, cached = self.cache_lookup(params)
+        start = time.perf_counter()
+        received = 0
+        status = None
+        body = bytearray() if key else None  # copy of the body for the cache, dropped if it grows too big
+
+        def counted(chunks):
+            nonlocal received, body
+            for chunk in chunks:
+                received += len(chunk)
+                if body is not None:
+                    body += chunk
+                    if len(body) > self.cache.max_entry_bytes:
+                        body = None
+                yield chunk
+
+        try:
+            with self.request('GET', '/getdata', params=params or None, stream=True,
+                              headers=cached.validators() if cached else None) as response:
+                status = response.status_code
+                if response.status_code == 304 and cached:  # unchanged since we cached it
+                    self.cache.touch(key)
+                    meta['not_modified'] = True
+                    yield from iter_array([cached.body], 'employees', meta)
+                    return
+                if response.status_code // 100 != 2:
+                    logger.warning("GET request failed with status code: %s", response.status_code)
+                    meta['error'] = f"status code {response.status_code}"
+                    return
+                self.metrics.record_phase('GET /getdata', 'server', response.elapsed.total_seconds())
+                yield from iter_array(counted(response.iter_content(chunk_size=65536)), 'employees', meta)
+                if body is not None:
+                    self.cache.put(key, response.headers.get('ETag'), response.headers.get('Last-Modified'), bytes(body))
+        except (requests.RequestException, ValueError) as e:
+            logger.error("GET request error: %s", e)
+            meta['error'] = str(e)
+        finally:
+            self.metrics.record('GET /getdata', time.perf_counter() - start, status=status,
+                                error='error' in meta, received=received)
+
+    def send_changes(self, since, params=None): # employees changed or deleted since the watermark, None if the server can't say
+        # the answer looks like {"employees": [...changed...], "deleted": [ids], "watermark": ...}
+        try:
+            response = self.request('GET', '/getdata', endpoint='GET /getdata?since', params={**(params or {}), 'since': since})
+            if response.status_code // 100 != 2:
+                logger.warning("Delta GET request failed with status code: %s", response.status_code)
+                return None
+            with self.metrics.timer('GET /getdata?since', 'decode'):
+                data = response.json()
+        except requests.RequestException as e:  # unreachable, which isn't a reason to reload everything
+            logger.error("Delta GET request error: %s", e)
+            raise
+        except ValueError as e:
+            logger.error("Delta GET request error: %s", e)
+            return None
+
+        if not isinstance(data, dict) or data.get('watermark') is None:  # the server ignored since
+            logger.info("Server doesn't support delta sync, reloading everything")
+            return None
+        self.lookups.invalidate([record.get('id') for record in data.get('employees') or [] if isinstance(record, dict)])
+        self.lookups.invalidate(data.get('deleted') or [])
+        return data
+
+    def listen_events(self, progress, retry=3, max_retry=60, heartbeat_timeout=60):
+        # runs on a worker thread, handing (type, record) for every "created", "updated" and "deleted"
+        # event to progress until it says stop, and returns why it stopped (None when asked to)
+        # dropped connections are picked up again where they left off with Last-Event-ID
+        last_id = None
+        delay = retry
+        self.events_wakeup.clear()
+        while True:
+            headers = {'Accept': 'text/event-stream'}
+            if last_id is not None:
+                headers['Last-Event-ID'] = last_id
+            response = None
+            dropped = "closed by the server"
+            start = time.perf_counter()
+            try:
+                response = self.request('GET', self.events_path, endpoint='GET /events', stream=True, headers=headers,
+                                        timeout=(self.timeout[0], heartbeat_timeout))
+                self.events_response = response
+                with response:
+                    if response.status_code in (404, 405):
+                        return "the server has no event stream"
+                    if response.status_code // 100 != 2:
+                        raise requests.RequestException(f"status code {response.status_code}")
+                    delay = retry
+                    for kind, data, id in iter_events(iter_lines(response)):
+                        last_id = id if id is not None else last_id
+                        event = decode_event(kind, data)
+                        if event and not progress(event):
+                            return None
+            except (requests.RequestException, ProtocolError, ReadTimeoutError, OSError) as e:  # reading raw raises urllib3's own
+                dropped = e
+            finally:
+                if self.events_response is response:
+                    self.events_response = None
+                if response is not None:  # one entry per connection, timed from connect to drop
+                    self.metrics.record('GET /events', time.perf_counter() - start, status=response.status_code,
+                                        error=response.status_code // 100 != 2)
+            if not progress(None):  # None only asks whether to carry on
+                return None
+            logger.warning("Event stream dropped (%s), reconnecting in %d s", dropped, delay)
+            self.events_wakeup.wait(delay)
+            delay = min(delay * 2, max_retry)
+            if not progress(None):
+                return None
+
+    def close_events(self): # called from the GUI thread, makes listen_events' blocking read end so it can stop
+        self.events_wakeup.set()
+        response = self.events_response
+        shutdown = getattr(response and response.raw, 'shutdown', None)  # urllib3 2.3+, older ones stop at the next heartbeat
+        if shutdown is not None:
+            try:
+                shutdown()  # closing the response here would wait for the read to finish
+            except (ValueError, RuntimeError):  # the stream has already ended
+                pass
+
     def send_put(self, data):
         try:
-            url = f'{self.base_url}/putdata/{data["id"]}'  # Use the ID directly in the URL
-            response = requests.put(url, json=data)  # Send the PUT request with the ID in the URL
+            # Use the ID directly in the URL
+            response = self.request('PUT', f'/putdata/{data["id"]}', endpoint='PUT /putdata/{id}', json=data)
+            self.lookups.invalidate([data["id"]])
             
             # Debugging output
-            print(f"PUT response status code: {response.status_code}")
-            print(f"PUT response text: {response.text}")
+            logger.debug("PUT response status code: %s", response.status_code)
+            logger.debug("PUT response text: %s", Payload(lambda: response.text))
             
             if response.status_code // 100 == 2:  # Success: checks for 2xx status codes
                 return response.json()
             else:
-                print(f"PUT request failed with status code: {response.status_code}")
+                logger.warning("PUT request failed with status code: %s", response.status_code)
                 return None
         except requests.RequestException as e:
-            print(f"PUT request error: {e}")
+            logger.error("PUT request error: %s", e)
             return None
 
     def send_delete(self, id):
         try:
-            response = requests.delete(f'{self.base_url}/deletedata/{id}')
+            response = self.request('DELETE', f'/deletedata/{id}', endpoint='DELETE /deletedata/{id}')
+            self.lookups.invalidate([id])
 
             if response.status_code // 100 == 2:  # Success: checks for 2xx status codes
-                print("DELETE request successful:", response.json())
-                return response.json()
+                data = response.json()
+                logger.debug("DELETE request successful: %s", Payload(data))
+                return data
             else:
-                print(f"DELETE request failed with status code: {response.status_code}")
+                logger.warning("DELETE request failed with status code: %s", response.status_code)
                 return None
         except requests.RequestException as e:
-            print(f"DELETE request error: {e}")
+            logger.error("DELETE request error: %s", e)
             return None
 
+    # the *_many calls return one result per item in the same order: True when the server took it, False when it
+    # didn't and None when the server stopped answering after the request went out, so it may have been applied
+
+    def send_post_many(self, records, concurrency=8):
+        return self.send_many('POST', '/postdata/batch', records, self.send_post, concurrency)
+
+    def send_put_many(self, records, concurrency=8):
+        return self.send_many('PUT', '/putdata/batch', records, self.send_put, concurrency)
+
+    def send_delete_many(self, ids, concurrency=8): # returns (deleted ids, {failed id: reason})
+        ids = list(ids)
+        results = self.send_many('DELETE', '/deletedata', ids, self.send_delete, concurrency,
+                                 payload=lambda chunk: {'ids': chunk}, key=lambda id: id)
+        deleted = [id for id, ok in zip(ids, results) if ok]
+        return deleted, {id: UNANSWERED if ok is None else "server rejected the delete" for id, ok in zip(ids, results) if not ok}
+
+    def send_writes(self, method, items, concurrency): # (ids done, {id: reason} failed) for a list of the same kind of write
+        if method == 'DELETE':
+            return self.send_delete_many(items, concurrency)
+        results = (self.send_post_many if method == 'POST' else self.send_put_many)(items, concurrency)
+        done = [item["id"] for item, ok in zip(items, results) if ok]
+        return done, {item["id"]: UNANSWERED if ok is None else "server rejected the change"
+                      for item, ok in zip(items, results) if not ok}
+
+    def write_many(self, method, items, concurrency=8, offline=False): # returns (ids done, {id: reason} failed, ids queued)
+        # with a journal, writes go into it instead when the server is known to be down, when earlier ones are
+        # still waiting (so they stay in order) or when they fail because the server can't be reached; a POST
+        # the server may have applied before it stopped answering isn't queued, sending it again could add it twice
+        items = list(items)
+        key = (lambda item: item) if method == 'DELETE' else (lambda item: item["id"])
+        if self.journal is not None and (offline or self.journal.depth(self.base_url)):
+            self.journal.append(self.base_url, method, items)
+            return [], {}, [key(item) for item in items]
+        done, failed = self.send_writes(method, items, concurrency)
+        if failed and self.journal is not None and not self.check_connection():
+            queued = {id for id, reason in failed.items() if method != 'POST' or reason != UNANSWERED}
+            self.journal.append(self.base_url, method, [item for item in items if key(item) in queued])
+            return done, {id: reason for id, reason in failed.items() if id not in queued}, list(queued)
+        return done, failed, []
+
+    def replay_journal(self, progress, concurrency=8, max_attempts=3): # sends the journal's writes in order, runs on a worker
+        # consecutive writes of one kind go out together through the batch routes, returns a summary; stops early
+        # when the server goes away again, writes it rejects are retried on later replays up to max_attempts times
+        server = self.base_url
+        summary = {'sent': 0, 'rejected': [], 'offline': False}
+        after = 0
+        while True:
+            writes = self.journal.pending(server, after, limit=self.batch_size * concurrency)
+            if not writes:
+                return summary
+            for method, run in groupby(writes, key=lambda write: write[1]):
+                run = list(run)
+                by_id = {}
+                for write in run:
+                    by_id.setdefault(write[2], []).append(write)
+                done, failed = self.send_writes(method, [item for _, _, _, item in run], concurrency)
+                self.journal.remove([write for id in done for write in by_id.pop(id, [])])
+                summary['sent'] += len(done)
+                if method == 'POST':  # ones that may have gone through are dropped and reported, not posted twice
+                    unanswered = [write for id, reason in failed.items() if reason == UNANSWERED for write in by_id.pop(id, [])]
+                    self.journal.remove(unanswered)
+                    summary['rejected'] += [(method, id, UNANSWERED) for _, _, id, _ in unanswered]
+                    failed = {id: reason for id, reason in failed.items() if reason != UNANSWERED}
+                if failed and not self.check_connection():
+                    summary['offline'] = True
+                    return summary
+                if failed:
+                    summary['rejected'] += self.journal.retry({write[0]: failed[id] for id in failed for write in by_id.get(id, [])},
+                                                              max_attempts)
+                after = run[-1][0]
+                if not progress(self.journal.depth(server)):
+                    return summary
+
+    def send_many(self, method, path, items, send_one, concurrency, payload=list, key=lambda record: record["id"]):
+        # sends items in batches of batch_size through the batch route, or one request per item
+        # with `concurrency` in flight when the server doesn't have that route
+        items = list(items)
+        results = []
+        for start in range(0, len(items), self.batch_size):
+            chunk = items[start:start + self.batch_size]
+            failed = self.send_batch(method, path, payload(chunk), [key(item) for item in chunk])
+            if failed is None:
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    results.extend(bool(response) for response in pool.map(send_one, chunk))
+            else:
+                results.extend(failed.get(key(item), True) for item in chunk)
+                self.lookups.invalidate(key(item) for item in chunk)
+        return results
+
+    def send_batch(self, method, path, payload, ids): # {id: False or None} for the ids that failed, like the *_many results
+        # None when the server can't take the batch; only a missing route falls back to one request per item, after
+        # a timeout or a 5xx the server may have done some of the batch and sending it again would stall or write twice
+        if self.batch_routes.get(path) is False:
+            return None
+        try:
+            response = self.request(method, path, json=payload)
+        except requests.RequestException as e:
+            logger.error("Batch %s request error: %s", method, e)
+            return dict.fromkeys(ids, False if never_sent(e) else None)
+
+        if response.status_code in (404, 405, 422):  # the route doesn't exist or doesn't take a list
+            self.batch_routes[path] = False
+            return None
+        if response.status_code // 100 != 2:
+            logger.warning("Batch %s request failed with status code: %s", method, response.status_code)
+            return dict.fromkeys(ids, False)
+        self.batch_routes[path] = True
+
+        # the server may list what it did or didn't do, otherwise a 2xx means every item went through
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        if isinstance(body, dict) and 'deleted' in body:
+            done = set(body['deleted'])
+            return {id: False for id in ids if id not in done}
+        if isinstance(body, dict) and 'failed' in body:
+            return dict.fromkeys(body['failed'], False)
+        return {}
+
 class SettingsManager: # used to load and save settings when opening and closing the app
     def __init__(self, main_window):
         self.main_window = main_window
@@ -497,6 +1031,10 @@ class SettingsManager: # used to load and save settings when opening and closing
         self.settings.setValue('window_pos', self.main_window.pos())
         self.settings.setValue('dark_mode', self.main_window.action_dark_mode.isChecked())
         self.settings.setValue('server_url', self.main_window.line_server.text())
+        self.settings.setValue('pool_size', self.main_window.api.pool_size)
+        self.settings.setValue('connect_timeout', self.main_window.api.timeout[0])
+        self.settings.setValue('read_timeout', self.main_window.api.timeout[1])
+        self.settings.setValue('batch_size', self.main_window.api.batch_size)
 
 class AboutWindow(QDialog, about_ui): # this is the About Window
     def __init__(self, dark_mode=False):
@@ -508,6 +1046,8 @@ class AboutWindow(QDialog, about_ui): # this is the About Window
 
 if __name__ == "__main__":
     app = QApplication(sys.argv) # needs to run first
+    settings = QSettings('settings.ini', QSettings.IniFormat)
+    setup_logging(settings.value('log_level', 'INFO'), settings.value('log_file') or None)
     main_window = MainWindow()
     main_window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -19,8 +19,8 @@ from PySide6.QtGui import (QAction, QBrush, QColor, QConicalGradient,
 from PySide6.QtWidgets import (QApplication, QGridLayout, QGroupBox, QHBoxLayout,
     QHeaderView, QLabel, QLineEdit, QMainWindow,
     QMenu, QMenuBar, QPushButton, QSizePolicy,
-    QSpacerItem, QStatusBar, QTableWidget, QTableWidgetItem,
-    QVBoxLayout, QWidget)
+    QSpacerItem, QStatusBar, QTableView, QVBoxLayout,
+    QWidget)
 import resources_rc
 
 class Ui_MainWindow(object):
@@ -208,9 +208,8 @@ class Ui_MainWindow(object):
 
         self.verticalLayout_3.addWidget(self.groupBox_3)
 
-        self.table = QTableWidget(self.centralwidget)
+        self.table = QTableView(self.centralwidget)
         self.table.setObjectName(u"table")
-        self.table.setRowCount(0)
         self.table.verticalHeader().setVisible(False)
 
         self.verticalLayout_3.addWidget(self.table)
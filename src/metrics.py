@@ -0,0 +1,93 @@
+import csv
+import json
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+PHASES = ('total', 'server', 'decode', 'fill')  # whole call, until response headers, JSON decoding, table fill
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+class EndpointStats: # counters for one endpoint plus the most recent timings of each phase
+    def __init__(self, samples):
+        self.count = 0
+        self.errors = 0
+        self.status = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.timings = {phase: deque(maxlen=samples) for phase in PHASES}
+
+class Metrics: # thread-safe, request threads record into it while the stats panel reads it
+    def __init__(self, samples=1000):
+        self.samples = samples  # timings kept per endpoint and phase for the percentiles
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def stats(self, endpoint):
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointStats(self.samples)
+        return self.endpoints[endpoint]
+
+    def record(self, endpoint, seconds, status=None, error=False, sent=0, received=0, server=None):
+        with self.lock:
+            stats = self.stats(endpoint)
+            stats.count += 1
+            stats.errors += bool(error)
+            if status is not None:
+                stats.status[status] += 1
+            stats.bytes_sent += sent
+            stats.bytes_received += received
+            stats.timings['total'].append(seconds)
+            if server is not None:
+                stats.timings['server'].append(server)
+
+    def record_phase(self, endpoint, phase, seconds):
+        with self.lock:
+            self.stats(endpoint).timings[phase].append(seconds)
+
+    @contextmanager
+    def timer(self, endpoint, phase='total'):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if phase == 'total':
+                self.record(endpoint, time.perf_counter() - start)
+            else:
+                self.record_phase(endpoint, phase, time.perf_counter() - start)
+
+    def reset(self):
+        with self.lock:
+            self.endpoints = {}
+
+    def snapshot(self): # one flat row per endpoint, times in milliseconds
+        rows = []
+        with self.lock:
+            for endpoint, stats in sorted(self.endpoints.items()):
+                row = {'endpoint': endpoint, 'count': stats.count, 'errors': stats.errors,
+                       'status': " ".join(f"{code}x{count}" for code, count in sorted(stats.status.items())),
+                       'bytes_sent': stats.bytes_sent, 'bytes_received': stats.bytes_received}
+                for phase in PHASES:
+                    values = list(stats.timings[phase])
+                    for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+                        value = percentile(values, fraction)
+                        row[f'{phase}_{name}_ms'] = None if value is None else round(value * 1000, 2)
+                rows.append(row)
+        return rows
+
+    def export_json(self, filename):
+        with open(filename, 'w') as file:
+            json.dump(self.snapshot(), file, indent=2)
+
+    def export_csv(self, filename):
+        rows = self.snapshot()
+        with open(filename, 'w', newline='') as file:
+            if rows:
+                writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
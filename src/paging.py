@@ -0,0 +1,317 @@
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtWidgets import QAbstractItemView
+from table_model import record_fields
+
+class PageLoader(QObject): # keeps a sliding window of /getdata pages in the table, loading more as the user scrolls
+    status = Signal(str)
+
+    def __init__(self, api, executor, model, view, page_size=1000, max_pages=5):
+        super().__init__(view)
+        self.api = api
+        self.executor = executor
+        self.model = model
+        self.view = view
+        self.page_size = page_size
+        self.max_pages = max_pages  # pages kept in the table at once, older ones are dropped
+        self.generation = 0  # bumped on every start so answers to an earlier Get are ignored
+        self.active = False
+        self.adjusting = False
+        self.watermark = None  # the server's "changed since" marker for what's loaded, None if it doesn't send one
+        self.params = {}
+        self.total = None
+        self.page_keys = {}
+        self.last_page = None
+        self.window = []
+        self.pages = {}
+        view.verticalScrollBar().valueChanged.connect(self.scrolled)
+
+    def start(self, params=None): # drops whatever is loaded and fetches the first page
+        self.generation += 1
+        self.params = dict(params or {})
+        self.page_keys = {0: {'offset': 0}}  # page -> how to ask for it, offsets or server cursors
+        self.last_page = None  # known once a short page comes back
+        self.total = None
+        self.window = []  # (page, row count) in the table, top to bottom
+        self.pages = {}  # pages that came back but aren't in the table yet
+        self.loading = set()
+        self.wanted = set()
+        self.active = True
+        self.watermark = None
+        self.model.clear()
+
+        # show what the cache has for the first page right away, the request below revalidates it
+        cached = self.api.cached_get(self.params, offset=0, limit=self.page_size)
+        self.provisional = bool(cached and isinstance(cached.get("employees"), list))
+        if self.provisional:
+            rows = [record_fields(record) for record in cached["employees"] if isinstance(record, dict)]
+            with self.api.metrics.timer('GET /getdata', 'fill'):
+                self.model.append_rows(rows)
+            self.window.append((0, len(rows)))
+            self.status.emit(f"Showing {len(rows)} cached employees, checking the server for changes...")
+        self.want(0)
+
+    def stop(self): # leaves the table as it is and stops paging
+        self.generation += 1
+        self.active = False
+        self.watermark = None
+        self.window = []  # whatever is in the table now isn't a run of pages, changes only update it
+        self.last_page = None
+
+    def state(self): # what a snapshot needs to carry on paging and syncing after a restart
+        return {'params': self.params, 'watermark': self.watermark, 'total': self.total, 'active': self.active,
+                'window': self.window, 'last_page': self.last_page,
+                'page_keys': {str(page): key for page, key in self.page_keys.items()}}
+
+    def restore(self, state): # picks up from state() with its rows already in the table, call sync() to catch up
+        self.generation += 1
+        self.params = dict(state.get('params') or {})
+        self.page_keys = {int(page): key for page, key in (state.get('page_keys') or {0: {'offset': 0}}).items()}
+        self.last_page = state.get('last_page')
+        self.total = state.get('total')
+        self.window = [tuple(entry) for entry in state.get('window') or []]
+        self.pages = {}
+        self.loading = set()
+        self.wanted = set()
+        self.provisional = False
+        self.active = bool(state.get('active'))
+        self.watermark = state.get('watermark')
+
+    def sync(self): # asks only for what changed since the last load and patches it into the table
+        generation = self.generation
+        self.status.emit("Checking the server for changes...")
+        self.executor.submit(self.api.send_changes, self.watermark, self.params,
+                             on_result=lambda changes: self.changes_arrived(generation, changes),
+                             on_error=lambda message: self.sync_failed(generation, message))
+
+    def sync_failed(self, generation, message): # the server couldn't be reached, what's loaded stays until the next try
+        if generation == self.generation:
+            self.status.emit(f"Couldn't check the server for changes: {message}")
+
+    def changes_arrived(self, generation, changes):
+        if generation != self.generation:
+            return
+        if changes is None:  # the server can't do deltas, load everything again
+            self.start(self.params)
+            return
+        rows = self.apply(changes.get("employees") or [], changes.get("deleted") or [], 'GET /getdata?since')
+        self.watermark = changes["watermark"]
+        if changes.get("total") is not None:
+            self.total = changes["total"]
+        self.status.emit(f"Synced {rows} changed and {len(changes.get('deleted') or [])} deleted employees")
+
+    def apply(self, records, deleted, endpoint): # patches changed and deleted employees into the loaded rows, returns how many changed
+        rows = [record_fields(record) for record in records if isinstance(record, dict)]
+        deleted = [str(id) for id in deleted]
+        with self.api.metrics.timer(endpoint, 'fill'):
+            missing = self.model.update_rows(rows)
+            gone = [self.model.row_of(id) for id in deleted if self.model.row_of(id) != -1]
+            self.uncount(gone)
+            self.model.remove_rows_at(gone)
+            if missing and self.at_end():  # new employees belong after the last page, which is on screen
+                self.append_rows(missing)
+        self.pages = {}  # prefetched pages may be older than the changes
+        return len(rows)
+
+    # --- rows added or removed in the table itself, e.g. a Post, a Delete or an import ---
+    # they go through here so the window's counts always add up to the table and dropping a page drops its own rows
+
+    def insert_row(self, row, values):
+        self.model.insert_row(row, values)
+        self.count(row, 1)
+
+    def append_rows(self, rows): # rows are tuples of the ten column values, they're counted into the last page
+        rows = list(rows)
+        first = self.model.rowCount()
+        self.model.append_rows(rows)
+        self.count(first, len(rows))
+
+    def remove_ids(self, ids): # drops many employees in a single model reset
+        self.uncount([row for row in map(self.model.row_of, ids) if row != -1])
+        self.model.remove_ids(ids)
+
+    def count(self, row, added): # adds rows inserted at row to the page they went into
+        first = 0
+        for i, (page, count) in enumerate(self.window):
+            if row <= first + count or i == len(self.window) - 1:
+                self.window[i] = (page, count + added)
+                return
+            first += count
+
+    def uncount(self, rows): # takes removed rows off the page counts in the window and moves the pages after them up
+        first = 0
+        above = {}  # page -> rows removed from the pages before it
+        removed = 0
+        for i, (page, count) in enumerate(self.window):
+            above[page] = removed
+            gone = sum(first <= row < first + count for row in rows)
+            self.window[i] = (page, count - gone)
+            removed += gone
+            first += count
+        if removed:  # on the server everything after the deleted rows moved up, pages past the window by all of them
+            self.page_keys = {page: {'offset': max(key['offset'] - above.get(page, removed), 0)}
+                              if 'offset' in key and page > self.window[0][0] else key
+                              for page, key in self.page_keys.items()}
+
+    def at_end(self): # whether the last page of the list is in the table
+        return self.last_page is not None and bool(self.window) and self.window[-1][0] >= self.last_page
+
+    def want(self, page):
+        if page in self.pages:
+            self.attach(page)
+        else:
+            self.wanted.add(page)
+            self.request(page)
+
+    def request(self, page):
+        key = self.page_keys.get(page)
+        if key is None or page in self.loading or page in self.pages or (self.last_page is not None and page > self.last_page):
+            return
+        self.loading.add(page)
+        generation = self.generation
+        if page == 0 and not self.window:  # the first page goes into the table while it's still downloading
+            self.executor.submit(self.fetch, key, True,
+                                 on_progress=lambda rows: self.rows_streamed(generation, rows),
+                                 on_result=lambda result: self.page_arrived(generation, page, result),
+                                 on_error=lambda message: self.page_arrived(generation, page, None))
+        else:
+            self.executor.submit(self.fetch, key, False,
+                                 on_result=lambda result: self.page_arrived(generation, page, result),
+                                 on_error=lambda message: self.page_arrived(generation, page, None))
+
+    def fetch(self, key, stream, progress=None, batch_rows=500): # runs on a worker thread, returns (response meta, rows)
+        # streamed rows are handed over through progress in batches as they're parsed instead of being returned
+        meta = {}
+        rows = []
+        count = 0
+        for record in self.api.send_get_stream(self.params, limit=self.page_size, meta=meta, **key):
+            if not isinstance(record, dict):
+                continue
+            rows.append(record_fields(record))
+            count += 1
+            if stream and len(rows) >= batch_rows:
+                if not progress(rows):
+                    break
+                rows = []
+        if stream and rows:
+            progress(rows)
+            rows = []
+        meta['count'] = count
+        return meta, rows
+
+    def rows_streamed(self, generation, rows):
+        if generation == self.generation:
+            with self.api.metrics.timer('GET /getdata', 'fill'):
+                self.model.append_rows(rows)
+
+    def page_arrived(self, generation, page, result):
+        if generation != self.generation:
+            return
+        self.loading.discard(page)
+        meta, rows = result or ({'error': "no response"}, [])
+        if meta.get('error'):
+            self.wanted.discard(page)
+            self.status.emit(f"Failed to load page {page + 1}: {meta['error']}")
+            return
+
+        streamed = page == 0 and not self.window
+        if page == 0 and self.provisional:  # the cached first page is on screen, swap it if the server sent something newer
+            self.provisional = False
+            streamed = True  # either way its rows are in the table now
+            if not meta.get('not_modified'):
+                with self.api.metrics.timer('GET /getdata', 'fill'):
+                    self.model.remove_rows(0, self.window[0][1])
+                    self.model.insert_rows(0, rows)
+            self.window = []
+        if page == 0:
+            self.watermark = meta.get("watermark")
+        if streamed and meta['count'] > self.page_size:  # the server ignored paging and sent everything
+            self.active = False
+            self.last_page = 0
+            self.window = [(0, self.model.rowCount())]
+            self.status.emit(f"Loaded {self.model.rowCount()} employees")
+            return
+        if page > 0 and rows and self.model.row_of(rows[0][0]) != -1:  # the server ignores offsets, there's nothing past page one
+            self.last_page = page - 1
+            self.wanted.discard(page)
+            return
+
+        if meta.get("total") is not None:
+            self.total = meta["total"]
+        if meta.get("next_cursor"):
+            self.page_keys[page + 1] = {'cursor': meta["next_cursor"]}
+        elif meta['count'] == self.page_size:
+            self.page_keys[page + 1] = {'offset': (page + 1) * self.page_size}
+        else:
+            self.last_page = page
+
+        if streamed:  # its rows are already in the table
+            self.wanted.discard(page)
+            self.window.append((page, meta['count']))
+            self.report()
+            self.request(page + 1)
+            return
+        self.pages[page] = rows
+        if page in self.wanted:
+            self.attach(page)
+
+    def attach(self, page): # puts a fetched page into the table if it sits next to the current window
+        self.wanted.discard(page)
+        rows = self.pages.pop(page)
+        with self.api.metrics.timer('GET /getdata', 'fill'):
+            self.place(page, rows)
+
+    def place(self, page, rows):
+        if not self.window:
+            self.model.append_rows(rows)
+            self.window.append((page, len(rows)))
+        elif page == self.window[-1][0] + 1:
+            self.model.append_rows(rows)
+            self.window.append((page, len(rows)))
+            if len(self.window) > self.max_pages:
+                self.drop_first()
+        elif page == self.window[0][0] - 1:
+            self.adjusting = True
+            self.model.insert_rows(0, rows)
+            self.shift_scroll(len(rows))
+            self.window.insert(0, (page, len(rows)))
+            if len(self.window) > self.max_pages:
+                self.drop_last()
+            self.adjusting = False
+        else:
+            return  # the window moved on while this page was loading
+        self.report()
+        self.request(self.window[-1][0] + 1)  # prefetch so scrolling down doesn't wait on the server
+
+    def drop_first(self):
+        page, count = self.window.pop(0)
+        self.adjusting = True
+        self.model.remove_rows(0, count)
+        self.shift_scroll(-count)
+        self.adjusting = False
+
+    def drop_last(self):
+        page, count = self.window.pop()
+        self.model.remove_rows(self.model.rowCount() - count, count)
+
+    def shift_scroll(self, rows): # keeps the same employees on screen when rows come or go above them
+        scrollbar = self.view.verticalScrollBar()
+        step = 1
+        if self.view.verticalScrollMode() == QAbstractItemView.ScrollPerPixel:
+            step = self.view.verticalHeader().defaultSectionSize()
+        scrollbar.setValue(scrollbar.value() + rows * step)
+
+    def scrolled(self, value):
+        if not self.active or self.adjusting or not self.window:
+            return
+        scrollbar = self.view.verticalScrollBar()
+        margin = (scrollbar.maximum() - scrollbar.minimum()) // 10
+        if value >= scrollbar.maximum() - margin:
+            self.want(self.window[-1][0] + 1)
+        elif value <= scrollbar.minimum() + margin and self.window[0][0] > 0:
+            self.want(self.window[0][0] - 1)
+
+    def report(self):
+        first = self.window[0][0] * self.page_size + 1
+        last = first + sum(count for _, count in self.window) - 1
+        total = f" of {self.total}" if self.total is not None else ""
+        self.status.emit(f"Showing employees {first}-{last}{total}")
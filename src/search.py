@@ -0,0 +1,223 @@
+import re
+import string
+import time
+from bisect import bisect_left
+from collections import deque
+from itertools import compress
+from operator import ne
+from PySide6.QtCore import QObject, QTimer, Signal
+
+TOKEN = re.compile(r"\w+")
+ASCII_LETTERS = frozenset(string.ascii_lowercase + string.digits + "_")  # what lower-cased ASCII words are made of
+
+def typos(term, letters): # everything one typo away from term: a letter missing, added, changed or two swapped
+    splits = [(term[:i], term[i:]) for i in range(len(term) + 1)]
+    variants = {head + tail[1:] for head, tail in splits if tail}
+    variants |= {head + tail[1] + tail[0] + tail[2:] for head, tail in splits if len(tail) > 1}
+    variants |= {head + letter + tail[1:] for head, tail in splits if tail for letter in letters}
+    variants |= {head + letter + tail for head, tail in splits for letter in letters}
+    return variants
+
+class SearchIndex(QObject): # inverted index of the words in the loaded employees, for searching every field at once
+    indexed = Signal()  # the queue ran dry after something new or different went in, searches are worth running again
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.postings = {}  # word -> ids of the employees it appears in
+        self.words = {}  # id -> the words indexed for it, to take them out again
+        self.hashes = {}  # id -> hash of the values it was indexed from, so a model reset only redoes what changed
+        self.vocabulary = None  # every word in order, None until it's first needed
+        self.added = set()  # words that came or went since the vocabulary was last brought up to date
+        self.removed = set()
+        self.text = None  # the vocabulary joined by newlines, substrings are found in it with str.find
+        self.letters = set(ASCII_LETTERS)  # characters typos are made of, every one in the words and maybe some that went
+        self.starts = {}  # two-letter word start -> how many employees have a word starting with it, to spot terms everyone has
+        self.model = None  # the table model being followed
+        self.queue = deque()  # ids loaded into the model but not indexed yet
+        self.timer = None  # indexes the queue a slice at a time so a big load doesn't freeze the window
+        self.updated = False  # something was indexed since the queue last ran dry
+
+    def __len__(self):
+        return len(self.words)
+
+    def clear(self):
+        self.postings = {}
+        self.words = {}
+        self.hashes = {}
+        self.vocabulary = None
+        self.added = set()
+        self.removed = set()
+        self.text = None
+        self.letters = set(ASCII_LETTERS)
+        self.starts = {}
+
+    def add(self, id, values): # values are the ten column strings, replaces whatever was indexed for id
+        if id in self.words:
+            self.remove(id)
+        self.hashes[id] = hash(tuple(values))
+        words = set(TOKEN.findall(" ".join(values[1:]).lower()))  # every column but the id, which has its own lookup
+        self.words[id] = tuple(words)
+        for word in words:
+            ids = self.postings.get(word)
+            if ids is None:
+                self.postings[word] = {id}
+                self.changed(word, self.added)
+                if not word.isascii():
+                    self.letters.update(word)
+            else:
+                ids.add(id)
+        starts = self.starts
+        for start in {word[:2] for word in words}:
+            starts[start] = starts.get(start, 0) + 1
+
+    def remove(self, id):
+        self.hashes.pop(id, None)
+        words = self.words.pop(id, ())
+        for start in {word[:2] for word in words}:
+            if self.starts[start] == 1:
+                del self.starts[start]
+            else:
+                self.starts[start] -= 1
+        for word in words:
+            ids = self.postings[word]
+            ids.discard(id)
+            if not ids:
+                del self.postings[word]
+                self.changed(word, self.removed)
+
+    def changed(self, word, pending):
+        self.text = None
+        if self.vocabulary is not None:
+            pending.add(word)
+
+    def sorted_words(self):
+        words = self.vocabulary
+        if words is not None and len(self.added) + len(self.removed) > len(words) // 100 + 1000:
+            words = None  # so much changed that sorting it all again is quicker
+        if words is None:
+            words = sorted(self.postings)
+        else:
+            for word in self.removed:
+                index = bisect_left(words, word)
+                if word not in self.postings and index < len(words) and words[index] == word:
+                    del words[index]
+            for word in self.added:
+                index = bisect_left(words, word)
+                if word in self.postings and (index == len(words) or words[index] != word):
+                    words.insert(index, word)
+        self.vocabulary = words
+        self.added = set()
+        self.removed = set()
+        return words
+
+    def vocabulary_text(self):
+        words = self.sorted_words()
+        if self.text is None:
+            self.text = "\n".join(words)
+        return self.text
+
+    def containing(self, piece): # the words that contain piece
+        text = self.vocabulary_text()
+        if text.count(piece) > len(self.vocabulary) // 50:  # common piece, checking every word is quicker
+            return [word for word in self.vocabulary if piece in word]
+        found = []
+        position = text.find(piece)
+        while position != -1:
+            start = text.rfind("\n", 0, position) + 1
+            end = text.find("\n", position)
+            end = len(text) if end == -1 else end
+            found.append(text[start:end])
+            position = text.find(piece, end)
+        return found
+
+    def matching_words(self, term, mode):
+        words = self.sorted_words()
+        if mode == 'fuzzy' and len(term) >= 4:  # words starting with the term give or take one typo
+            found = set()
+            for variant in typos(term, self.letters) | {term}:
+                start = bisect_left(words, variant)
+                end = bisect_left(words, variant + "\uffff", start)
+                found.update(words[start:end])
+            return found
+        if mode == 'substring' and len(term) >= 3:
+            return self.containing(term)
+        if mode in ('prefix', 'substring', 'fuzzy'):  # one or two letters match word starts whatever the mode
+            start = bisect_left(words, term)
+            end = bisect_left(words, term + "\uffff", start)
+            return words[start:end]
+        raise ValueError(f"unknown search mode {mode!r}")
+
+    def search(self, query, mode='prefix'): # ids of the indexed employees matching every word of the query, don't change the set
+        # rows still queued aren't found yet, indexed is emitted once they're in so the search can run again
+        result = None
+        everyone = len(self.words)
+        for term in sorted(set(TOKEN.findall(query.lower())), key=len, reverse=True):  # longest terms narrow it down fastest
+            if len(term) == 2 and self.starts.get(term) == everyone:  # two letters only ever match word starts
+                result = self.words.keys() if result is None else result  # every employee, nothing to merge
+                continue
+            words = self.matching_words(term, mode)
+            postings = list(map(self.postings.__getitem__, words))
+            widest = max(postings, key=len, default=set())
+            if result is not None and len(result) * 4 < sum(map(len, postings)):  # checking the few left beats merging
+                words = set(words)
+                result = {id for id in result if not words.isdisjoint(self.words[id])}
+            elif result is not None and len(widest) == everyone:
+                pass  # a term every employee has doesn't narrow anything down
+            else:
+                ids = widest if len(widest) == everyone or len(postings) == 1 else set().union(*postings)
+                result = ids if result is None else result & ids  # a single word's ids aren't copied, callers only read them
+            if not result:
+                break
+        return set() if result is None else result
+
+    def index_queued(self, budget=0.004): # indexes queued ids for up to budget seconds, all of them for None
+        model = self.model
+        queue = self.queue
+        deadline = None if budget is None else time.perf_counter() + budget
+        while queue:
+            for _ in range(min(200, len(queue))):  # the clock is only read every so often
+                id = queue.popleft()
+                row = model.rows_by_id.get(id)
+                if row is None:  # removed again before its turn
+                    continue
+                values = [column[row] for column in model.columns]
+                if self.hashes.get(id) != hash(tuple(values)):
+                    self.add(id, values)
+                    self.updated = True
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+        if self.timer:
+            self.timer.stop()
+        if self.updated:
+            self.updated = False
+            self.indexed.emit()
+
+    def enqueue(self, ids):
+        self.queue.extend(ids)
+        if self.queue:
+            self.timer.start()
+
+    def follow(self, model): # keeps the index in step with everything the model loads, edits and drops
+        self.model = model
+        self.timer = QTimer()
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.index_queued)
+
+        def removing(parent, first, last):
+            for id in model.columns[0][first:last + 1]:
+                self.remove(id)
+
+        def reset(): # e.g. remove_ids, employees that are gone are dropped now and only new or changed ones queued
+            loaded = model.rows_by_id
+            for id in [id for id in self.words if id not in loaded]:
+                self.remove(id)
+            ids = model.columns[0]
+            self.queue.clear()
+            self.enqueue(compress(ids, map(ne, map(self.hashes.get, ids), map(hash, zip(*model.columns)))))
+
+        model.modelReset.connect(reset)
+        model.rowsInserted.connect(lambda parent, first, last: self.enqueue(model.columns[0][first:last + 1]))
+        model.rowsAboutToBeRemoved.connect(removing)
+        model.dataChanged.connect(lambda top_left, bottom_right, roles=():
+                                  self.enqueue(model.columns[0][top_left.row():bottom_right.row() + 1]))
+        reset()
@@ -0,0 +1,90 @@
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (QDockWidget, QFileDialog, QHBoxLayout, QLabel, QMessageBox, QPushButton, QTableWidget,
+                               QTableWidgetItem, QVBoxLayout, QWidget)
+
+COLUMNS = [('Endpoint', 'endpoint'), ('Calls', 'count'), ('Errors', 'errors'), ('Status', 'status'),
+           ('Sent', 'bytes_sent'), ('Received', 'bytes_received'),
+           ('p50 ms', 'total_p50_ms'), ('p95 ms', 'total_p95_ms'), ('p99 ms', 'total_p99_ms'),
+           ('Server p50', 'server_p50_ms'), ('Decode p50', 'decode_p50_ms'), ('Fill p50', 'fill_p50_ms')]
+
+def size_text(count):
+    for unit in ('B', 'KB', 'MB'):
+        if count < 1024:
+            return f"{count:.0f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+class StatsPanel(QDockWidget): # dockable live view of the API client's metrics
+    def __init__(self, metrics, parent=None, interval_ms=1000, lookups=None):
+        super().__init__("Request Stats", parent)
+        self.setObjectName("stats_panel")
+        self.metrics = metrics
+        self.lookups = lookups  # the API's LookupCache, its hit rate is shown under the table
+
+        self.table = QTableWidget(0, len(COLUMNS))  # only a handful of rows, one per endpoint
+        self.table.setHorizontalHeaderLabels([title for title, _ in COLUMNS])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+
+        self.button_export_json = QPushButton("Export JSON")
+        self.button_export_csv = QPushButton("Export CSV")
+        self.button_reset = QPushButton("Reset")
+        self.button_export_json.clicked.connect(lambda: self.export('JSON Files (*.json)', self.metrics.export_json))
+        self.button_export_csv.clicked.connect(lambda: self.export('CSV Files (*.csv)', self.metrics.export_csv))
+        self.button_reset.clicked.connect(self.reset)
+
+        self.label_lookups = QLabel()
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.label_lookups)
+        buttons.addStretch()
+        buttons.addWidget(self.button_export_json)
+        buttons.addWidget(self.button_export_csv)
+        buttons.addWidget(self.button_reset)
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+        widget = QWidget()
+        widget.setLayout(layout)
+        self.setWidget(widget)
+
+        # refresh only while the panel is visible
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.setInterval(interval_ms)
+        self.visibilityChanged.connect(lambda visible: self.timer.start() if visible else self.timer.stop())
+
+    def refresh(self):
+        rows = self.metrics.snapshot()
+        self.table.setRowCount(len(rows))
+        for row, stats in enumerate(rows):
+            for column, (_, key) in enumerate(COLUMNS):
+                value = stats[key]
+                if key.startswith('bytes'):
+                    text = size_text(value)
+                else:
+                    text = "" if value is None else str(value)
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+        if self.lookups is not None:
+            stats = self.lookups.stats()
+            rate = "-" if stats['hit_rate'] is None else f"{stats['hit_rate']:.0%}"
+            self.label_lookups.setText(f"ID lookups: {stats['hits']} hits, {stats['misses']} misses ({rate}), "
+                                       f"{stats['size']}/{stats['capacity']} cached")
+
+    def reset(self):
+        self.metrics.reset()
+        if self.lookups is not None:
+            self.lookups.reset_stats()
+        self.refresh()
+
+    def export(self, file_filter, write):
+        filename, _ = QFileDialog.getSaveFileName(self, 'Export Stats', '', file_filter)
+        if not filename:
+            return
+        try:
+            write(filename)
+        except OSError as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export stats: {str(e)}")
@@ -0,0 +1,271 @@
+import sys
+from contextlib import contextmanager
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtWidgets import QHeaderView
+
+COLUMNS = ['ID', 'First Name', 'Middle Name', 'Last Name', 'Age', 'Title', 'Address 1', 'Address 2', 'Country', 'Misc']
+# columns with few distinct values, interned so all the rows with the same value share one string instead of a copy each
+SHARED = [COLUMNS.index(name) for name in ('Middle Name', 'Age', 'Title', 'Address 2', 'Country', 'Misc')]
+
+def record_fields(record): # flattens an employee record from the API into the ten table columns
+    name = record.get("name") or {}
+    address = record.get("address") or {}
+    age = record.get("age")
+    return (record.get("id") or "",
+            name.get("first_name", "") or "",
+            name.get("middle_name", "") or "",
+            name.get("last_name", "") or "",
+            "" if age is None else str(age),
+            record.get("title") or "",
+            address.get("address_1", "") or "",
+            address.get("address_2", "") or "",
+            address.get("country", "") or "",
+            record.get("misc") or "")
+
+class EmployeeTableModel(QAbstractTableModel): # holds the employees one list per column instead of one widget item per cell
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = [[] for _ in COLUMNS]
+        self.rows_by_id = {}  # employee id -> row, kept current by every method that moves rows
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns[0])
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        return self.columns[index.column()][index.row()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable  # cells are edited in place before a PUT
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        if index.column() == 0:
+            self.rows_by_id.pop(self.columns[0][index.row()], None)
+            self.rows_by_id[str(value)] = index.row()
+        value = str(value)
+        self.columns[index.column()][index.row()] = sys.intern(value) if index.column() in SHARED else value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def row_values(self, row): # the ten column strings of one row
+        return tuple(column[row] for column in self.columns)
+
+    def row_of(self, id): # row holding the employee id, -1 if it isn't loaded
+        return self.rows_by_id.get(id, -1)
+
+    def clear(self):
+        self.beginResetModel()
+        self.columns = [[] for _ in COLUMNS]
+        self.rows_by_id = {}
+        self.endResetModel()
+
+    def set_records(self, records): # replaces everything with API records in a single model reset
+        self.beginResetModel()
+        self.columns = [[] for _ in COLUMNS]
+        self.rows_by_id = {}
+        self.extend_columns(record_fields(record) for record in records if isinstance(record, dict))
+        self.endResetModel()
+
+    def set_columns(self, columns): # replaces everything with ready-made column lists, e.g. from a snapshot
+        self.beginResetModel()
+        self.columns = columns
+        self.share(0, len(columns[0]))
+        self.rows_by_id = dict(zip(columns[0], range(len(columns[0]))))
+        self.endResetModel()
+
+    def append_rows(self, rows): # rows are tuples of the ten column values
+        rows = list(rows)
+        if not rows:
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.extend_columns(rows)
+        self.endInsertRows()
+
+    def insert_row(self, row, values):
+        self.beginInsertRows(QModelIndex(), row, row)
+        for column, value in zip(self.columns, values):
+            column.insert(row, "" if value is None else str(value))
+        self.share(row, row + 1)
+        self.reindex(row)
+        self.endInsertRows()
+
+    def insert_rows(self, row, rows): # rows are tuples of the ten column values
+        rows = [tuple("" if value is None else str(value) for value in values) for values in rows]
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(rows) - 1)
+        for column, values in zip(self.columns, zip(*rows)):
+            column[row:row] = values
+        self.share(row, row + len(rows))
+        self.reindex(row)
+        self.endInsertRows()
+
+    def remove_rows(self, first, count):
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), first, first + count - 1)
+        for id in self.columns[0][first:first + count]:
+            self.rows_by_id.pop(id, None)
+        for column in self.columns:
+            del column[first:first + count]
+        self.reindex(first)
+        self.endRemoveRows()
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.rows_by_id.pop(self.columns[0][row], None)
+        for column in self.columns:
+            del column[row]
+        self.reindex(row)
+        self.endRemoveRows()
+
+    def update_rows(self, rows): # overwrites the rows whose id is loaded, returns the rows that aren't
+        missing = []
+        for values in rows:
+            row = self.rows_by_id.get(values[0])
+            if row is None:
+                missing.append(values)
+                continue
+            for column, value in zip(self.columns, values):
+                column[row] = "" if value is None else str(value)
+            self.share(row, row + 1)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1), [Qt.DisplayRole, Qt.EditRole])
+        return missing
+
+    def remove_rows_at(self, rows): # removes a few scattered rows run by run, unlike remove_ids the view keeps its selection and scroll
+        rows = sorted(set(rows), reverse=True)
+        if not rows:
+            return
+        runs = []  # (first, count) from the bottom up so earlier runs don't move
+        for row in rows:
+            if runs and row == runs[-1][0] - 1:
+                runs[-1] = (row, runs[-1][1] + 1)
+            else:
+                runs.append((row, 1))
+        for first, count in runs:
+            self.beginRemoveRows(QModelIndex(), first, first + count - 1)
+            for id in self.columns[0][first:first + count]:
+                self.rows_by_id.pop(id, None)
+            for column in self.columns:
+                del column[first:first + count]
+            self.reindex(first)  # before rowsRemoved, its listeners look rows up by id
+            self.endRemoveRows()
+
+    def remove_ids(self, ids): # drops many employees in a single model reset
+        ids = set(ids)
+        if not ids:
+            return
+        self.beginResetModel()
+        keep = [row for row, id in enumerate(self.columns[0]) if id not in ids]
+        self.columns = [[column[row] for row in keep] for column in self.columns]
+        self.rows_by_id = {}
+        self.reindex(0)
+        self.endResetModel()
+
+    def extend_columns(self, rows):
+        first = len(self.columns[0])
+        for values in rows:
+            for column, value in zip(self.columns, values):
+                column.append("" if value is None else str(value))
+        self.share(first, len(self.columns[0]))
+        self.reindex(first)
+
+    def share(self, first, last): # interns the SHARED columns' values in rows first to last - 1
+        for index in SHARED:
+            column = self.columns[index]
+            column[first:last] = map(sys.intern, column[first:last])
+
+    def reindex(self, first): # rows from first onwards have moved, point their ids at the new positions
+        ids = self.columns[0]
+        for row in range(first, len(ids)):
+            self.rows_by_id[ids[row]] = row
+
+class ColumnSizer: # keeps column widths fitted to their contents without rescanning every row
+    def __init__(self, view, sample_rows=200, padding=16, max_width=400):
+        self.view = view
+        self.sample_rows = sample_rows  # most rows ever measured for one fit
+        self.padding = padding
+        self.max_width = max_width
+        self.filling = False
+
+        # every row has the same height, so Qt never has to measure rows
+        rows = view.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.Fixed)
+        rows.setDefaultSectionSize(view.fontMetrics().height() + 8)
+
+        model = view.model()
+        model.modelReset.connect(self.fit)
+        model.rowsInserted.connect(self.rows_inserted)
+        model.dataChanged.connect(self.data_changed)
+
+    @contextmanager
+    def batch(self): # suspends repaints and resizing while a lot of rows go in, then fits once
+        self.filling = True
+        self.view.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.filling = False
+            self.fit()
+            self.view.setUpdatesEnabled(True)
+
+    def sample(self, first, last): # evenly spaced rows between first and last, at most sample_rows of them
+        count = last - first + 1
+        if count <= self.sample_rows:
+            return range(first, last + 1)
+        step = count / self.sample_rows
+        return sorted({first + int(i * step) for i in range(self.sample_rows)} | {last})
+
+    def widest(self, column, rows):
+        model = self.view.model()
+        metrics = self.view.fontMetrics()
+        width = 0
+        for row in rows:
+            text = model.data(model.index(row, column))
+            if text:
+                width = max(width, metrics.horizontalAdvance(text))
+        return width + self.padding
+
+    def fit(self): # sizes every column from its header and a sample of rows
+        if self.filling:
+            return
+        model = self.view.model()
+        header = self.view.horizontalHeader()
+        header_metrics = header.fontMetrics()
+        rows = self.sample(0, model.rowCount() - 1) if model.rowCount() else ()
+        for column in range(model.columnCount()):
+            title = model.headerData(column, Qt.Horizontal) or ""
+            width = max(header_metrics.horizontalAdvance(title) + self.padding, self.widest(column, rows))
+            header.resizeSection(column, min(width, self.max_width))
+
+    def grow(self, first, last, first_column, last_column): # widens columns that new or edited rows no longer fit in
+        if self.filling:
+            return
+        header = self.view.horizontalHeader()
+        rows = self.sample(first, last)
+        for column in range(first_column, last_column + 1):
+            width = min(self.widest(column, rows), self.max_width)
+            if width > header.sectionSize(column):
+                header.resizeSection(column, width)
+
+    def rows_inserted(self, parent, first, last):
+        self.grow(first, last, 0, self.view.model().columnCount() - 1)
+
+    def data_changed(self, top_left, bottom_right, roles=()):
+        self.grow(top_left.row(), bottom_right.row(), top_left.column(), bottom_right.column())
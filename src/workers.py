@@ -0,0 +1,78 @@
+import logging
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+logger = logging.getLogger(__name__)
+
+class WorkerSignals(QObject): # QRunnable isn't a QObject, so its signals live here
+    result = Signal(object)
+    progress = Signal(object)
+    error = Signal(str)
+    finished = Signal()
+
+class Worker(QRunnable): # runs a single blocking call on a pool thread
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def cancel(self): # a request already on the wire can't be interrupted, its result is just dropped
+        self.cancelled = True
+
+    def report(self, value): # handed to the call as `progress`, returns False once it should stop
+        if self.cancelled:
+            return False
+        self.signals.progress.emit(value)
+        return True
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+        else:
+            if not self.cancelled:
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+class RequestExecutor(QObject): # runs API calls in the background and hands the results back to the GUI thread
+    def __init__(self, max_threads=8, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.active = set()  # workers that are queued or running
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_finished=None, on_progress=None, **kwargs):
+        worker = Worker(fn, *args, **kwargs)
+        if on_progress:  # the call reports partial results through a `progress` callback
+            worker.kwargs['progress'] = worker.report
+            worker.signals.progress.connect(on_progress)
+        if on_result:
+            worker.signals.result.connect(on_result)
+        if on_error:
+            worker.signals.error.connect(on_error)
+        else:
+            worker.signals.error.connect(lambda message: logger.error("Background request error: %s", message))
+        if on_finished:
+            worker.signals.finished.connect(on_finished)
+        worker.signals.finished.connect(lambda: self.active.discard(worker))
+        self.active.add(worker)
+        self.pool.start(worker)
+        return worker
+
+    def pending(self):
+        return len(self.active)
+
+    def cancel_all(self):
+        for worker in list(self.active):
+            worker.cancel()
+
+    def shutdown(self, timeout_ms=3000):
+        self.cancel_all()
+        self.pool.waitForDone(timeout_ms)
@@ -0,0 +1,47 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+from http.server import ThreadingHTTPServer
+from PySide6.QtWidgets import QApplication
+from stand_in_server import Handler, Store, fake_employee
+
+def employee(n, last_name=None): # the ten column strings of a made-up employee
+    return (f"id{n:04d}", f"First{n}", "", last_name or f"Last{n}", str(20 + n % 40), "Engineer",
+            f"{n} Main St", "", "Canada", "")
+
+def wait_until(condition, timeout=10): # runs the event loop until condition() holds, so worker results get delivered
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting")
+        QApplication.processEvents()
+        time.sleep(0.005)
+
+@pytest.fixture(scope="session")
+def app():
+    return QApplication.instance() or QApplication([])
+
+def serve(handler=Handler, seed=2500): # starts a stand-in server on a free port, returns (base url, store, server)
+    store = Store()
+    for number in range(seed):
+        store.save(fake_employee(number))
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), type('TestHandler', (handler,), {'store': store}))
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{httpd.server_port}", store, httpd
+
+@pytest.fixture
+def server(): # a stand-in server with 2500 made-up employees, yields (base url, store)
+    url, store, httpd = serve()
+    yield url, store
+    httpd.shutdown()
+    httpd.server_close()
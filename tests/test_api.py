@@ -0,0 +1,97 @@
+import time
+import pytest
+from conftest import serve
+from journal import Journal
+from main import API, UNANSWERED
+from stand_in_server import Handler, fake_employee
+
+class FlakyHandler(Handler): # the batch route answers with `batch_status`, or not in time when it's None
+    batch_status = 503
+    single_posts = []  # paths of the requests that weren't batches
+
+    def do_POST(self):
+        if self.path == '/postdata/batch':
+            self.read_json()
+            if self.batch_status is None:
+                time.sleep(1)
+            self.send_json(self.batch_status or 200, {'detail': 'nope'})
+            return
+        self.single_posts.append(self.path)
+        super().do_POST()
+
+@pytest.fixture
+def flaky():
+    def start(status):
+        handler = type('Flaky', (FlakyHandler,), {'batch_status': status, 'single_posts': []})
+        url, store, httpd = serve(handler, seed=0)
+        api = API(batch_size=3)
+        api.base_url = url
+        servers.append((httpd, api))
+        return api, handler, store
+    servers = []
+    yield start
+    for httpd, api in servers:
+        api.close()
+        httpd.shutdown()
+        httpd.server_close()
+
+def records(count):
+    return [fake_employee(number) for number in range(count)]
+
+def test_batches_go_through_the_batch_route(server):
+    api = API(batch_size=3)
+    api.base_url = server[0]
+    assert api.send_post_many(records(7)) == [True] * 7
+    assert api.batch_routes == {'/postdata/batch': True}
+    assert len(server[1].employees) == 2507
+    api.close()
+
+def test_server_error_fails_the_whole_chunk(flaky):
+    api, handler, store = flaky(503)
+    assert api.send_post_many(records(5)) == [False] * 5
+    assert handler.single_posts == []
+    assert '/postdata/batch' not in api.batch_routes
+
+def test_timeout_fails_the_whole_chunk(flaky):
+    api, handler, store = flaky(None)
+    api.timeout = (1, 0.2)
+    assert api.send_post_many(records(2)) == [None] * 2  # may have gone through
+    assert handler.single_posts == []
+
+def test_missing_batch_route_falls_back_to_single_requests(flaky):
+    api, handler, store = flaky(404)
+    assert api.send_post_many(records(5)) == [True] * 5
+    assert handler.single_posts == ['/postdata'] * 5
+    assert api.batch_routes == {'/postdata/batch': False}
+    assert len(store.employees) == 5
+
+def test_unanswered_posts_are_not_queued(flaky, tmp_path):
+    api, handler, store = flaky(None)
+    api.timeout = (1, 0.2)
+    api.journal = Journal(str(tmp_path / "journal.sqlite"))
+    api.check_connection = lambda: False  # it went away after taking the request
+    done, failed, queued = api.write_many('POST', records(2))
+    assert done == [] and queued == []
+    assert set(failed.values()) == {UNANSWERED}
+    assert api.journal.depth(api.base_url) == 0
+
+    done, failed, queued = api.write_many('PUT', records(2))  # sending a PUT again can't do any harm
+    assert len(queued) == 2 and failed == {}
+
+def test_unanswered_posts_are_dropped_from_the_journal(flaky, tmp_path):
+    api, handler, store = flaky(None)
+    api.timeout = (1, 0.2)
+    api.journal = Journal(str(tmp_path / "journal.sqlite"))
+    api.write_many('POST', records(2), offline=True)
+    summary = api.replay_journal(lambda depth: True)
+    assert [(method, reason) for method, _, reason in summary['rejected']] == [('POST', UNANSWERED)] * 2
+    assert api.journal.depth(api.base_url) == 0
+
+def test_refused_connections_are_queued(tmp_path):
+    api = API(connect_timeout=0.5, probe_timeout=0.5)
+    api.base_url = "http://127.0.0.1:9"
+    api.journal = Journal(str(tmp_path / "journal.sqlite"))
+    done, failed, queued = api.write_many('POST', records(2))
+    assert len(queued) == 2 and failed == {}
+    api.journal.close()
+    api.close()
@@ -0,0 +1,47 @@
+import csv
+from bulk_import import BulkImport
+from conftest import employee
+from formats import nested
+from main import API
+from table_model import COLUMNS, EmployeeTableModel
+
+def test_import_skips_loaded_employees(app, server, tmp_path):
+    filename = str(tmp_path / "employees.csv")
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        writer.writerows(employee(n) for n in range(6))
+        writer.writerow(employee(2))  # repeated in the file
+    api = API()
+    api.base_url = server[0]
+    model = EmployeeTableModel()
+    model.append_rows([employee(0)])
+    importer = BulkImport(api, filename, lambda *values: nested(values), lambda id: model.row_of(id) != -1)
+    model.set_columns([list(column) for column in zip(employee(0), employee(1))])  # a reset replaces the table's index
+    imported = []
+    summaries = []
+    importer.rows_imported.connect(imported.extend)
+    importer.finished.connect(summaries.append)
+    importer.run()
+    assert [values[0] for values in imported] == ["id0002", "id0003", "id0004", "id0005"]
+    assert summaries[0]['imported'] == 4 and summaries[0]['skipped'] == 3 and summaries[0]['failed'] == 0
+    assert {"id0002", "id0005"} <= set(server[1].employees)
+    api.close()
+
+def test_streaming_import_catches_repeats_within_its_limit(app, server, tmp_path):
+    filename = str(tmp_path / "employees.csv")
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        writer.writerows(employee(n) for n in (0, 1, 0, 2, 3, 1, 3))
+    api = API()
+    api.base_url = server[0]
+    importer = BulkImport(api, filename, lambda *values: nested(values), lambda id: False, stream_threshold=0,
+                          seen_limit=3)
+    summaries = []
+    importer.finished.connect(summaries.append)
+    importer.run()
+    assert summaries[0]['streaming'] and importer.seen_ids == {hash("id0000"), hash("id0001"), hash("id0002")}
+    assert summaries[0]['skipped'] == 2  # the repeats of id0000 and id0001
+    assert summaries[0]['unchecked'] == 2 and summaries[0]['imported'] == 5  # id0003 past the limit went twice
+    api.close()
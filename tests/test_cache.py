@@ -0,0 +1,130 @@
+import os
+import time
+import pytest
+from cache import ResponseCache
+from main import API
+from stand_in_server import fake_employee
+
+@pytest.fixture
+def responses(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    yield cache
+    cache.close()
+
+@pytest.fixture
+def api(server, responses):
+    api = API()
+    api.base_url = server[0]
+    api.cache = responses
+    yield api
+    api.close()
+
+def statuses(api):
+    return dict(api.metrics.stats('GET /getdata').status)
+
+def test_entries_expire(responses):
+    responses.ttl = 0.05
+    responses.put("a", '"v1"', None, b"body")
+    assert responses.get("a").body == b"body"
+    time.sleep(0.1)
+    assert responses.get("a") is None
+    responses.put("a", '"v1"', None, b"body")
+    time.sleep(0.03)
+    responses.touch("a")  # revalidated, so trusted for another TTL
+    time.sleep(0.03)
+    assert responses.get("a").validators() == {'If-None-Match': '"v1"'}
+
+def test_least_recently_used_go_first(responses):
+    responses.max_bytes = 2500
+    for key in "abc":
+        responses.put(key, None, None, os.urandom(1000))  # random bytes don't compress
+        time.sleep(0.01)
+        if key == "b":
+            responses.get("a")
+    assert responses.get("a") is not None
+    assert responses.get("b") is None
+    assert responses.get("c") is not None
+
+def test_oversized_bodies_are_not_cached(responses):
+    responses.max_entry_bytes = 100
+    responses.put("big", None, None, b"x" * 101)
+    responses.put("small", None, None, b"x" * 100)
+    assert responses.get("big") is None and responses.get("small") is not None
+
+def test_fetch_get_revalidates(api, server):
+    first = api.fetch_get({'limit': 10})
+    assert api.fetch_get({'limit': 10}) == first
+    assert statuses(api) == {200: 1, 304: 1}
+    server[1].save(fake_employee(9000))
+    assert api.fetch_get({'limit': 10})['total'] == first['total'] + 1
+    assert statuses(api) == {200: 2, 304: 1}
+
+def test_stream_revalidates(api):
+    meta = {}
+    first = list(api.send_get_stream(limit=100, meta=meta))
+    assert len(first) == 100 and 'not_modified' not in meta
+    meta = {}
+    assert list(api.send_get_stream(limit=100, meta=meta)) == first
+    assert meta['not_modified'] and meta['total'] == 2500
+    assert statuses(api) == {200: 1, 304: 1}
+
+def test_stream_drops_bodies_past_the_cutoff(api, responses):
+    responses.max_entry_bytes = 10000
+    assert len(list(api.send_get_stream(limit=200))) == 200
+    assert responses.get(responses.key(f'{api.base_url}/getdata', {'limit': 200})) is None
+    assert len(list(api.send_get_stream(limit=5))) == 5
+    assert responses.get(responses.key(f'{api.base_url}/getdata', {'limit': 5})) is not None
+
+def lookups(server, **kwargs):
+    api = API(**kwargs)
+    api.base_url = server[0]
+    return api
+
+def test_lookups_hit_and_miss(server):
+    api = lookups(server)
+    id = list(server[1].employees)[0]
+    found = api.send_get({'id': id})
+    assert found['employees'][0]['id'] == id
+    assert api.send_get({'id': id}) is found
+    assert api.send_get({'id': "missing"}) == {'employees': []}
+    assert api.send_get({'limit': 5})['total'] == 2500  # not a single-employee lookup, the LRU isn't asked
+    assert api.lookups.stats() == {'size': 2, 'capacity': 256, 'hits': 1, 'misses': 2, 'hit_rate': 1 / 3}
+    assert api.metrics.stats('GET /getdata').count == 3
+    api.close()
+
+def test_lookups_expire(server):
+    api = lookups(server, lookup_ttl=0.05)
+    id = list(server[1].employees)[0]
+    api.send_get({'id': id})
+    time.sleep(0.1)
+    api.send_get({'id': id})
+    assert api.lookups.stats()['hits'] == 0 and api.lookups.stats()['misses'] == 2
+    api.close()
+
+def test_lookups_are_bounded(server):
+    api = lookups(server, lookup_size=3)
+    ids = list(server[1].employees)[:4]
+    for id in ids[:3]:
+        api.send_get({'id': id})
+    api.send_get({'id': ids[0]})  # now the most recently used
+    api.send_get({'id': ids[3]})
+    assert list(api.lookups.entries) == [ids[2], ids[0], ids[3]]
+    api.close()
+
+def test_changes_drop_lookups(server):
+    api = lookups(server, batch_size=10)
+    store = server[1]
+    ids = list(store.employees)[:5]
+    for id in ids:
+        api.send_get({'id': id})
+    api.send_put({**store.employees[ids[0]], 'misc': "changed"})
+    assert api.send_get({'id': ids[0]})['employees'][0]['misc'] == "changed"
+    api.send_delete(ids[1])
+    assert api.send_get({'id': ids[1]}) == {'employees': []}
+    api.send_put_many([{**store.employees[ids[2]], 'misc': "batched"}])
+    api.send_delete_many([ids[3]])
+    assert api.send_get({'id': ids[2]})['employees'][0]['misc'] == "batched"
+    assert api.send_get({'id': ids[3]}) == {'employees': []}
+    api.send_get({'id': ids[4]})
+    assert api.lookups.stats()['hits'] == 1  # only the employee nothing was sent for
+    api.close()
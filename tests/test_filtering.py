@@ -0,0 +1,103 @@
+from PySide6.QtCore import QItemSelectionModel
+from PySide6.QtWidgets import QTableView
+from conftest import employee
+from filtering import FilterSortModel
+from table_model import COLUMNS, EmployeeTableModel
+
+LAST_NAME = COLUMNS.index('Last Name')
+
+def sorted_by_last_name(app):
+    model = EmployeeTableModel()
+    model.append_rows(employee(n, f"Name{n:02d}") for n in range(50))
+    proxy = FilterSortModel(model)
+    proxy.set_filter(COLUMNS.index('Country'), "canada")
+    proxy.sort_by(LAST_NAME)
+    proxy.refresh()
+    view = QTableView()
+    view.setModel(proxy)
+    resets = []
+    proxy.modelReset.connect(lambda: resets.append(True))
+    return model, proxy, view, resets
+
+def selected_ids(view):
+    proxy = view.model()
+    return sorted(proxy.data(proxy.index(index.row(), 0)) for index in view.selectionModel().selectedRows())
+
+def select(view, row):
+    view.setCurrentIndex(view.model().index(row, 0))
+    view.selectionModel().select(view.model().index(row, 0), QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+
+def test_mapping(app):
+    model, proxy, view, resets = sorted_by_last_name(app)
+    proxy.sort_by(LAST_NAME)  # descending
+    proxy.refresh()
+    assert proxy.data(proxy.index(0, 0)) == "id0049"
+    assert proxy.mapToSource(proxy.index(0, 0)).row() == 49
+    assert proxy.mapFromSource(model.index(0, 0)).row() == 49
+
+def test_edit_in_place_keeps_the_selection(app):
+    model, proxy, view, resets = sorted_by_last_name(app)
+    select(view, 10)
+    changes = []
+    proxy.layoutChanged.connect(lambda: changes.append(True))
+    proxy.setData(proxy.index(10, COLUMNS.index('Title')), "Manager")
+    assert proxy.data(proxy.index(10, COLUMNS.index('Title'))) == "Manager"
+    proxy.settle()
+    assert not changes and not resets
+    assert selected_ids(view) == ["id0010"]
+
+def test_edit_that_moves_a_row_keeps_the_selection(app):
+    model, proxy, view, resets = sorted_by_last_name(app)
+    select(view, 10)
+    proxy.setData(proxy.index(10, LAST_NAME), "Aaron")
+    proxy.settle()
+    assert proxy.data(proxy.index(0, 0)) == "id0010"
+    assert selected_ids(view) == ["id0010"]
+    assert view.currentIndex().row() == 0
+    assert not resets
+
+def test_edit_that_filters_a_row_out(app):
+    model, proxy, view, resets = sorted_by_last_name(app)
+    select(view, 10)
+    proxy.setData(proxy.index(10, COLUMNS.index('Country')), "Mexico")
+    proxy.settle()
+    assert proxy.rowCount() == view.verticalHeader().count() == 49
+    assert selected_ids(view) == []
+    assert not resets
+
+def test_appended_rows_are_filtered(app):
+    model, proxy, view, resets = sorted_by_last_name(app)
+    select(view, 3)
+    model.append_rows([employee(60, "Abe"), employee(61, "Abe")[:8] + ("Mexico", "")])
+    proxy.settle()
+    assert proxy.rowCount() == view.verticalHeader().count() == 51
+    assert proxy.data(proxy.index(0, 0)) == "id0060"
+    assert selected_ids(view) == ["id0003"]
+    assert not resets
+
+def test_max_age_only_agrees_with_edits(app):
+    model = EmployeeTableModel()
+    model.append_rows([employee(n) for n in range(10)] + [employee(10)[:4] + ("",) + employee(10)[5:]])
+    proxy = FilterSortModel(model)
+    proxy.set_age_range(None, 24)
+    proxy.refresh()
+    shown = [proxy.data(proxy.index(row, 0)) for row in range(proxy.rowCount())]
+    assert shown == ["id0000", "id0001", "id0002", "id0003", "id0004"]  # the blank age isn't under 24
+    assert [proxy.accepts(row, None) for row in range(11)] == [True] * 5 + [False] * 6
+    model.setData(model.index(7, COLUMNS.index('Age')), "3")
+    proxy.settle()
+    assert proxy.rowCount() == 6
+
+def test_sort_keys_in_mixed_directions(app):
+    model = EmployeeTableModel()
+    model.append_rows(employee(n, f"Name{n % 7}") for n in range(100))
+    proxy = FilterSortModel(model)
+    proxy.sort_by(LAST_NAME)
+    proxy.sort_by(LAST_NAME)  # descending
+    proxy.sort_by(COLUMNS.index('Age'), add=True)
+    proxy.refresh()
+    ids = [proxy.data(proxy.index(row, 0)) for row in range(100)]
+    rows = sorted(range(100), key=lambda n: int(model.columns[4][n]))
+    rows.sort(key=lambda n: model.columns[LAST_NAME][n].lower(), reverse=True)
+    assert ids == [model.columns[0][n] for n in rows]
+    assert all(proxy.in_order(position) for position in range(100))
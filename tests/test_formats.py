@@ -0,0 +1,40 @@
+import os
+import pytest
+from bulk_import import BulkImport
+from conftest import employee
+from export import EmployeeExport
+from formats import format_for, nested
+from main import API
+from table_model import record_fields
+
+NEEDS = {'.jsonl.zst': 'zstandard', '.parquet': 'pyarrow', '.arrow': 'pyarrow'}
+
+@pytest.mark.parametrize('extension', ['.csv', '.jsonl', '.jsonl.gz', '.jsonl.zst', '.parquet', '.arrow'])
+def test_export_then_import(app, server, tmp_path, extension):
+    if extension in NEEDS:
+        pytest.importorskip(NEEDS[extension])
+    rows = [employee(n) for n in range(1200)]
+    rows[7] = rows[7][:3] + ('O"Brien, Zoë',) + rows[7][4:9] + ("line one\nline two",)
+    columns = [list(column) for column in zip(*rows)]
+    filename = str(tmp_path / f"employees{extension}")
+    exported = []
+    export = EmployeeExport(filename, chunk_rows=500).from_table(columns, range(1199, -1, -1))
+    export.finished.connect(exported.append)
+    export.run()
+    assert exported[0]['written'] == 1200 and exported[0]['error'] is None
+    assert not os.path.exists(filename + '.part')
+    with format_for(filename).read() as reader:
+        assert next(reader.rows)['ID'] == "id1199"  # written in the order the table showed them
+
+    api = API()
+    api.base_url = server[0]
+    imported = []
+    summaries = []
+    importer = BulkImport(api, filename, lambda *values: nested(values), lambda id: False, chunk_rows=300)
+    importer.rows_imported.connect(imported.extend)
+    importer.finished.connect(summaries.append)
+    importer.run()
+    api.close()
+    assert summaries[0]['imported'] == 1200 and summaries[0]['failed'] == 0 and summaries[0]['error'] is None
+    assert sorted(imported) == rows  # batches are sent concurrently, so they can come back in any order
+    assert record_fields(server[1].employees["id0007"]) == rows[7]
@@ -0,0 +1,68 @@
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from PySide6.QtWidgets import QApplication
+from conftest import serve, wait_until
+from health import HealthMonitor
+from main import API
+from stand_in_server import Handler
+from workers import RequestExecutor
+
+class TrackedHandler(Handler): # remembers its connections so a stop can drop the kept-alive ones too, like a crash would
+    connections = []
+
+    def setup(self):
+        super().setup()
+        self.connections.append(self.connection)
+
+def stop(httpd):
+    httpd.shutdown()
+    httpd.server_close()
+    for connection in httpd.RequestHandlerClass.connections:
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+def test_monitor_follows_the_server_down_and_up(app):
+    url, store, httpd = serve(type('Tracked', (TrackedHandler,), {'connections': []}), seed=0)
+    api = API()
+    api.base_url = url
+    probes = []
+    check_connection = api.check_connection
+    api.check_connection = lambda: probes.append(time.monotonic()) or check_connection()
+    executor = RequestExecutor()
+    monitor = HealthMonitor(api, executor, interval_ms=50, max_interval_ms=200)
+    changes = []
+    monitor.status_changed.connect(changes.append)
+    monitor.check_now()
+    wait_until(lambda: changes == [True])
+
+    probed = len(probes)
+    until = time.monotonic() + 0.4
+    while time.monotonic() < until:  # traffic more often than the interval, so there's no need to probe
+        api.send_get({'limit': 1})
+        QApplication.processEvents()
+        time.sleep(0.01)
+    assert len(probes) == probed
+
+    stop(httpd)
+    waits = {}  # failures in a row -> wait before the next probe
+    def backed_off():
+        if not monitor.in_flight and monitor.timer.isActive():
+            waits[monitor.failures] = monitor.timer.interval()
+        return monitor.failures >= 4
+    wait_until(backed_off)
+    assert changes == [True, False]  # the failures after the first don't say anything new
+    assert [waits.get(failures) for failures in (1, 2, 3, 4)] == [100, 200, 200, 200]
+
+    port = int(url.rsplit(':', 1)[1])
+    httpd = ThreadingHTTPServer(('127.0.0.1', port), httpd.RequestHandlerClass)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    wait_until(lambda: changes == [True, False, True])
+    assert monitor.failures == 0 and api.is_connected
+    monitor.stop()
+    executor.shutdown()
+    api.close()
+    stop(httpd)
@@ -0,0 +1,98 @@
+from journal import Journal
+from main import API
+from stand_in_server import fake_employee
+
+SERVER = "http://example.test"
+
+def test_pending_writes_keep_their_order(tmp_path):
+    journal = Journal(str(tmp_path / "journal.sqlite"))
+    first, second = fake_employee(1), fake_employee(2)
+    journal.append(SERVER, 'POST', [first])
+    journal.append(SERVER, 'DELETE', [second["id"]])
+    journal.append(SERVER, 'PUT', [dict(first, title="Manager")])  # replaces the waiting POST's record
+    journal.append("http://other.test", 'DELETE', [first["id"]])
+    pending = journal.pending(SERVER)
+    assert [(method, id) for _, method, id, _ in pending] == [('POST', first["id"]), ('DELETE', second["id"])]
+    assert pending[0][3]["title"] == "Manager"
+    assert journal.depth(SERVER) == 2
+
+    seq = pending[1][0]
+    assert journal.retry({seq: "nope"}, max_attempts=2) == []
+    assert journal.retry({seq: "still nope"}, max_attempts=2) == [('DELETE', second["id"], "still nope")]
+    journal.remove([pending[0]])
+    assert journal.depth(SERVER) == 0
+    assert journal.depth("http://other.test") == 1
+    journal.close()
+
+def test_edits_merged_into_a_write_being_sent_are_kept(tmp_path):
+    journal = Journal(str(tmp_path / "journal.sqlite"))
+    posted, edited = fake_employee(1), fake_employee(2)
+    journal.append(SERVER, 'POST', [posted])
+    journal.append(SERVER, 'PUT', [dict(edited, title="v1")])
+    sent = journal.pending(SERVER)
+    journal.append(SERVER, 'PUT', [dict(posted, title="Manager"), dict(edited, title="v2")])  # while those are on the wire
+    journal.remove(sent)
+    assert [(method, item["title"]) for _, method, _, item in journal.pending(SERVER)] == [('POST', "Manager"), ('PUT', "v2")]
+    journal.close()
+
+def test_replay_sends_writes_in_the_order_they_were_made(server, tmp_path):
+    url, store = server
+    api = API()
+    api.base_url = url
+    api.journal = Journal(str(tmp_path / "journal.sqlite"))
+    existing = next(iter(store.employees))
+    added, temporary = fake_employee(10001), fake_employee(10002)
+
+    assert api.write_many('POST', [added], offline=True) == ([], {}, [added["id"]])
+    api.write_many('PUT', [dict(added, title="Manager")])  # queued behind the POST even though the server is up
+    api.write_many('DELETE', [existing])
+    api.write_many('POST', [temporary])
+    api.write_many('DELETE', [temporary["id"]])
+    api.write_many('POST', [dict(fake_employee(3), id=existing, title="Back again")])
+    assert api.journal.depth(url) == 5
+
+    depths = []
+    summary = api.replay_journal(lambda depth: depths.append(depth) or True)
+    assert summary == {'sent': 5, 'rejected': [], 'offline': False}
+    assert depths[-1] == 0
+    assert store.employees[added["id"]]["title"] == "Manager"
+    assert store.employees[existing]["title"] == "Back again"  # deleted, then posted again
+    assert temporary["id"] not in store.employees
+    assert len(store.employees) == 2501
+    api.journal.close()
+    api.close()
+
+def test_replay_stops_when_the_server_is_gone(tmp_path):
+    api = API(connect_timeout=0.5, probe_timeout=0.5)
+    api.base_url = "http://127.0.0.1:9"  # nothing listens on the discard port
+    api.journal = Journal(str(tmp_path / "journal.sqlite"))
+    api.write_many('DELETE', ["a", "b"], offline=True)
+    summary = api.replay_journal(lambda depth: True)
+    assert summary == {'sent': 0, 'rejected': [], 'offline': True}
+    assert api.journal.depth(api.base_url) == 2
+    api.journal.close()
+    api.close()
+
+def test_edit_made_during_a_replay_is_sent_afterwards(server, tmp_path):
+    url, store = server
+    api = API()
+    api.base_url = url
+    api.journal = Journal(str(tmp_path / "journal.sqlite"))
+    id = next(iter(store.employees))
+    api.write_many('PUT', [dict(store.employees[id], title="v1")], offline=True)
+    send_writes = api.send_writes
+
+    def edited_meanwhile(method, items, concurrency): # the user edits the row again while the replay is sending it
+        api.write_many('PUT', [dict(store.employees[id], title="v2")])
+        return send_writes(method, items, concurrency)
+
+    api.send_writes = edited_meanwhile
+    assert api.replay_journal(lambda depth: True)['sent'] == 1
+    assert store.employees[id]["title"] == "v1"
+    assert api.journal.depth(url) == 1
+    api.send_writes = send_writes
+    api.replay_journal(lambda depth: True)
+    assert store.employees[id]["title"] == "v2"
+    assert api.journal.depth(url) == 0
+    api.journal.close()
+    api.close()
@@ -0,0 +1,28 @@
+import json
+import pytest
+from json_stream import iter_array
+
+def chunked(text, size): # the UTF-8 body cut into size-byte pieces, splitting characters and numbers anywhere
+    body = text.encode('utf-8')
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+@pytest.mark.parametrize('size', [1, 3, 7, 64, 100000])
+def test_items_come_out_whatever_the_chunk_size(size):
+    employees = [{"id": str(n), "name": {"first_name": "Zoë"}, "age": 12345 + n, "misc": "a, [b] {c}"} for n in range(50)]
+    body = json.dumps({"total": 50, "employees": employees, "watermark": 987654321, "next_cursor": None})
+    meta = {}
+    assert list(iter_array(chunked(body, size), "employees", meta)) == employees
+    assert meta == {"total": 50, "watermark": 987654321, "next_cursor": None}
+
+def test_empty_and_missing_arrays():
+    meta = {}
+    assert list(iter_array([b'{"employees": [], "total": 0}'], "employees", meta)) == []
+    assert meta == {"total": 0}
+    assert list(iter_array([b'{}'], "employees", {})) == []
+    meta = {}
+    assert list(iter_array([b'{"message": "no employees"}'], "employees", meta)) == []
+    assert meta == {"message": "no employees"}
+
+def test_cut_short_body_raises():
+    with pytest.raises(ValueError):
+        list(iter_array([b'{"employees": [{"id": "1"}, {"id'], "employees", {}))
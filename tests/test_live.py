@@ -0,0 +1,119 @@
+import threading
+import time
+import pytest
+import requests
+from PySide6.QtWidgets import QTableView
+from conftest import serve, wait_until
+from live import LiveUpdates, iter_events, iter_lines
+from main import API
+from paging import PageLoader
+from stand_in_server import Handler, fake_employee
+from table_model import EmployeeTableModel
+from workers import RequestExecutor
+
+class RecordingHandler(Handler): # keeps the Last-Event-ID of every /events request, pings every 0.2 s
+    heartbeat = 0.2
+    resumed_from = []
+
+    def stream_events(self):
+        self.resumed_from.append(self.headers.get('Last-Event-ID'))
+        super().stream_events()
+
+@pytest.fixture
+def events():
+    handler = type('Recording', (RecordingHandler,), {'resumed_from': []})
+    url, store, httpd = serve(handler, seed=50)
+    api = API()
+    api.base_url = url
+    yield api, store, handler
+    api.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+def listen(api, **kwargs): # runs listen_events on a thread, returns (received events, thread, stop event)
+    received, stop = [], threading.Event()
+    def progress(event):
+        if event is not None:
+            received.append(event)
+        return not stop.is_set()
+    thread = threading.Thread(target=api.listen_events, args=(progress,), kwargs=kwargs, daemon=True)
+    thread.start()
+    return received, thread, stop
+
+def settle(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.01)
+
+def test_events_are_parsed():
+    lines = [": ping", "", "id: 7", "event: updated", "data: {\"id\": 1,", "data:  \"a\": 2}", "", "data: x", ""]
+    assert list(iter_events(lines)) == [('updated', '{"id": 1,\n "a": 2}', '7'), ('message', 'x', '7')]
+
+def test_lines_arrive_before_the_stream_ends(events):
+    api, store, _ = events
+    with requests.get(api.base_url + '/events', stream=True, timeout=5) as response:
+        lines = iter_lines(response)
+        store.save(fake_employee(900))
+        assert next(line for line in lines if line.startswith('event:')) == 'event: created'
+
+def test_changes_are_received_and_resumed_after_a_drop(events):
+    api, store, handler = events
+    received, thread, stop = listen(api, retry=0.1)
+    settle(lambda: api.events_response is not None)
+    created = fake_employee(900)
+    store.save(created)
+    store.update({**created, 'name': {**created['name'], 'first_name': "Changed"}})
+    store.delete(created['id'])
+    settle(lambda: len(received) == 3)
+    assert [kind for kind, _ in received] == ['created', 'updated', 'deleted']
+    assert received[1][1]['name']['first_name'] == "Changed"
+    api.events_response.raw.shutdown()  # looks like the server dropped the connection
+    missed = fake_employee(901)
+    store.save(missed)  # sent while nobody's listening
+    settle(lambda: len(received) == 4)
+    assert received[3] == ('created', missed)
+    assert handler.resumed_from == [None, str(store.version - 1)]
+    stop.set()
+    api.close_events()
+    thread.join(5)
+    assert not thread.is_alive()
+
+def test_close_events_stops_the_listener(app, events):
+    api, store, _ = events
+    executor = RequestExecutor()
+    finished = []
+    worker = executor.submit(api.listen_events, on_progress=lambda event: None, on_finished=lambda: finished.append(1))
+    wait_until(lambda: api.events_response is not None)
+    start = time.monotonic()
+    worker.cancel()
+    api.close_events()
+    wait_until(lambda: finished, timeout=5)
+    assert time.monotonic() - start < 1  # not left waiting for the 60 s heartbeat timeout
+    wait_until(lambda: not store.listeners)  # the server saw the connection go
+    executor.shutdown()
+
+def test_live_updates_patch_the_table(app, events):
+    api, store, _ = events
+    executor = RequestExecutor()
+    model = EmployeeTableModel()
+    view = QTableView()
+    view.setModel(model)
+    pager = PageLoader(api, executor, model, view, page_size=1000)
+    pager.start()
+    wait_until(lambda: model.rowCount() == 50 and not pager.loading)
+    live = LiveUpdates(api, executor, pager, view, interval_ms=10)
+    live.start()
+    wait_until(lambda: api.events_response is not None)
+    first, second = list(store.employees)[:2]
+    record = store.employees[first]
+    store.update({**record, 'name': {**record['name'], 'first_name': "Renamed"}})
+    store.delete(second)
+    created = fake_employee(900)
+    store.save(created)
+    wait_until(lambda: model.rowCount() == 50 and model.row_of(created['id']) != -1)
+    assert model.columns[1][model.row_of(first)] == "Renamed"
+    assert model.row_of(second) == -1
+    live.stop()
+    wait_until(lambda: not store.listeners)
+    executor.shutdown()
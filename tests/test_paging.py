@@ -0,0 +1,68 @@
+import pytest
+from PySide6.QtWidgets import QTableView
+from conftest import employee, wait_until
+from main import API
+from paging import PageLoader
+from table_model import EmployeeTableModel
+from workers import RequestExecutor
+
+@pytest.fixture
+def pager(app, server):
+    api = API()
+    api.base_url = server[0]
+    executor = RequestExecutor()
+    model = EmployeeTableModel()
+    view = QTableView()
+    view.setModel(model)
+    pager = PageLoader(api, executor, model, view, page_size=1000, max_pages=2)
+    pager.start()
+    wait_until(lambda: pager.window and 1 in pager.page_keys and not pager.loading)
+    pager.want(1)
+    wait_until(lambda: len(pager.window) == 2)
+    yield pager
+    executor.shutdown()
+    api.close()
+
+def counted(pager):
+    return sum(count for _, count in pager.window)
+
+def test_pages_load_into_the_window(pager):
+    assert pager.window == [(0, 1000), (1, 1000)]
+    assert pager.model.rowCount() == 2000
+    assert pager.total == 2500
+    assert pager.page_keys[2] == {'offset': 2000}
+
+def test_table_changes_are_counted(pager, server):
+    ids = list(server[1].employees)
+    pager.remove_ids([ids[5], ids[1500], "missing"])
+    assert pager.window == [(0, 999), (1, 999)]
+    assert pager.page_keys[1] == {'offset': 999}
+    assert pager.page_keys[2] == {'offset': 1998}
+
+    pager.insert_row(500, employee(1))
+    pager.append_rows([employee(2), employee(3)])
+    assert pager.window == [(0, 1000), (1, 1001)]
+    assert counted(pager) == pager.model.rowCount()
+
+    pager.drop_first()
+    assert pager.model.rowCount() == 1001
+    assert pager.model.columns[0][0] == ids[1000]
+
+def test_delta_sync_patches_the_window(pager, server):
+    store = server[1]
+    ids = list(store.employees)
+    store.delete(ids[10])
+    store.delete(ids[1010])
+    store.delete(ids[2010])  # not loaded, the client can't tell where it was
+    changed = dict(store.employees[ids[20]], title="Changed")
+    store.update(changed)
+    watermark = pager.watermark
+
+    pager.sync()
+    wait_until(lambda: pager.watermark != watermark)
+    assert pager.window == [(0, 999), (1, 999)]
+    assert counted(pager) == pager.model.rowCount() == 1998
+    assert pager.model.row_of(ids[1010]) == -1
+    assert pager.model.columns[5][pager.model.row_of(ids[20])] == "Changed"
+    assert pager.page_keys[2] == {'offset': 1998}
+    assert pager.total == 2497
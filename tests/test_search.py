@@ -0,0 +1,70 @@
+from PySide6.QtWidgets import QTableView
+from conftest import employee, wait_until
+from filtering import FilterBar, FilterSortModel
+from search import SearchIndex
+from table_model import EmployeeTableModel
+
+def indexed_model(count):
+    model = EmployeeTableModel()
+    index = SearchIndex()
+    index.follow(model)
+    model.append_rows(employee(n) for n in range(count))
+    return model, index
+
+def test_modes(app):
+    model, index = indexed_model(200)
+    index.index_queued(None)
+    assert index.search("first12") == {"id0012", *(f"id{n:04d}" for n in range(120, 130))}
+    assert index.search("first12 last120") == {"id0120"}
+    assert index.search("irst199", 'substring') == {"id0199"}
+    assert index.search("frist199", 'fuzzy') == {"id0199"}
+    assert index.search("main canada") == set(model.columns[0])
+    assert index.search("nobody") == set()
+
+def test_search_only_finds_indexed_rows_until_caught_up(app):
+    model, index = indexed_model(500)
+    caught_up = []
+    index.indexed.connect(lambda: caught_up.append(True))
+    assert index.search("first1") == set()  # nothing indexed yet, and searching doesn't wait for it
+    wait_until(lambda: caught_up)
+    assert len(index.search("first1")) == 111  # First1, First10-19 and First100-199
+    assert not index.queue
+
+def test_reset_queues_only_what_changed(app):
+    model, index = indexed_model(100)
+    index.index_queued(None)
+    columns = [list(column) for column in model.columns]
+    columns[3][7] = "Changed"
+    model.set_columns(columns)
+    assert list(index.queue) == ["id0007"]
+    index.index_queued(None)
+    assert index.search("changed") == {"id0007"}
+
+    model.remove_ids(["id0007", "id0008"])
+    assert not index.queue
+    assert index.search("changed") == set()
+    assert len(index) == 98
+
+def test_search_box_runs_again_once_indexed(app):
+    model, index = indexed_model(50)
+    index.index_queued(None)
+    proxy = FilterSortModel(model)
+    view = QTableView()
+    view.setModel(proxy)
+    bar = FilterBar(proxy, view, index)
+    bar.line_search.setText("last6")
+    bar.apply()
+    assert proxy.rowCount() == 1
+    model.append_rows(employee(n) for n in range(60, 70))
+    wait_until(lambda: proxy.rowCount() == 11)
+
+def test_terms_everyone_has_and_accented_typos(app):
+    model, index = indexed_model(30)
+    model.append_rows([employee(99, "Zoë")])
+    index.index_queued(None)
+    assert index.search("ma") == set(model.columns[0])  # every employee lives on Main St
+    assert index.search("zo") == {"id0099"}
+    assert index.search("zoëe", 'fuzzy') == {"id0099"}
+    model.remove_rows_at([5])
+    assert len(index.search("ma")) == 30
+    assert index.search("ma first2") == {"id0002", *(f"id{n:04d}" for n in range(20, 30))}
@@ -0,0 +1,29 @@
+from conftest import employee
+from snapshot import load_snapshot, save_snapshot
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    columns = [list(values) for values in zip(*(employee(n) for n in range(100)))]
+    columns[9][5] = "naïve\0note"  # NULs can't be stored, they're dropped
+    state = {'watermark': 42, 'window': [[0, 100]], 'server': "http://127.0.0.1:8000"}
+    save_snapshot(path, columns, state)
+    loaded, loaded_state = load_snapshot(path)
+    columns[9][5] = "naïvenote"
+    assert loaded == columns
+    assert loaded_state['watermark'] == 42 and loaded_state['window'] == [[0, 100]] and loaded_state['rows'] == 100
+
+def test_empty_table(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    save_snapshot(path, [[] for _ in range(10)], {})
+    assert load_snapshot(path)[0] == [[] for _ in range(10)]
+
+def test_unusable_files_are_ignored(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    assert load_snapshot(str(path)) is None
+    path.write_bytes(b"")
+    assert load_snapshot(str(path)) is None
+    path.write_bytes(b"not a snapshot at all")
+    assert load_snapshot(str(path)) is None
+    save_snapshot(str(path), [["a", "b"]], {})
+    path.write_bytes(path.read_bytes()[:-1])
+    assert load_snapshot(str(path)) is None
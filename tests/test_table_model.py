@@ -0,0 +1,30 @@
+from conftest import employee
+from filtering import FilterSortModel
+from search import SearchIndex
+from table_model import EmployeeTableModel
+
+def shown_ids(proxy):
+    return [proxy.data(proxy.index(row, 0)) for row in range(proxy.rowCount())]
+
+def test_remove_rows_at_keeps_rows_by_id_current(app):
+    model = EmployeeTableModel()
+    model.append_rows(employee(n) for n in range(20))
+    model.remove_rows_at([3, 4, 10, 17])
+    assert model.rowCount() == 16
+    assert all(model.row_of(id) == row for row, id in enumerate(model.columns[0]))
+    assert model.row_of("id0004") == -1
+
+def test_remove_rows_at_with_search_active(app):
+    model = EmployeeTableModel()
+    model.append_rows(employee(n, "Zed" if n in (10, 50, 90) else None) for n in range(100))
+    index = SearchIndex()
+    index.follow(model)
+    index.index_queued(None)
+    proxy = FilterSortModel(model)
+    proxy.set_search(lambda: index.search("zed"))
+    proxy.refresh()
+    assert shown_ids(proxy) == ["id0010", "id0050", "id0090"]
+
+    model.remove_rows_at([5, 6, 30, 50, 70])  # every run's rowsRemoved re-runs the search
+    assert shown_ids(proxy) == ["id0010", "id0090"]
+    assert [model.columns[0][proxy.source_row(row)] for row in range(proxy.rowCount())] == ["id0010", "id0090"]
@@ -0,0 +1,218 @@
+# Local stand-in for the employee API, for trying the client without the real FastAPI server.
+# It keeps everything in memory and supports what the client knows how to use: paging, ETags,
+# delta sync with ?since=, the batch routes and a Server-Sent Events stream at /events.
+#
+#   python tools/stand_in_server.py --port 8000 --seed 5000
+#
+# then enter 127.0.0.1:8000 as the server and set live_updates=true in settings.ini.
+import argparse
+import hashlib
+import json
+import queue
+import threading
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+class Store: # the employees plus a version number for every change, so ?since= and Last-Event-ID work
+    def __init__(self, history=10000):
+        self.lock = threading.Lock()
+        self.employees = {}
+        self.version = 0
+        self.changed = {}  # id -> version it was last created or updated in
+        self.deleted = {}  # id -> version it was deleted in
+        self.events = deque(maxlen=history)  # (version, type, record) for clients that reconnect
+        self.listeners = []  # one queue per open /events stream
+
+    def publish(self, kind, record): # called with the lock held
+        self.version += 1
+        self.events.append((self.version, kind, record))
+        for listener in self.listeners:
+            listener.put((self.version, kind, record))
+        return self.version
+
+    def save(self, record):
+        with self.lock:
+            kind = 'updated' if record['id'] in self.employees else 'created'
+            self.employees[record['id']] = record
+            self.deleted.pop(record['id'], None)
+            self.changed[record['id']] = self.publish(kind, record)
+
+    def update(self, record): # False when there's no such employee
+        with self.lock:
+            if record['id'] not in self.employees:
+                return False
+            self.employees[record['id']] = record
+            self.changed[record['id']] = self.publish('updated', record)
+            return True
+
+    def delete(self, id): # False when there's no such employee
+        with self.lock:
+            if self.employees.pop(id, None) is None:
+                return False
+            self.changed.pop(id, None)
+            self.deleted[id] = self.publish('deleted', {'id': id})
+            return True
+
+    def since(self, version):
+        with self.lock:
+            return {'employees': [self.employees[id] for id, changed in self.changed.items() if changed > version],
+                    'deleted': [id for id, deleted in self.deleted.items() if deleted > version],
+                    'watermark': self.version, 'total': len(self.employees)}
+
+    def page(self, offset, limit):
+        with self.lock:
+            employees = list(self.employees.values())
+            return {'employees': employees[offset:offset + limit], 'total': len(employees), 'watermark': self.version}
+
+    def listen(self, last_version): # a queue that gets every event after last_version, then every new one
+        listener = queue.Queue()
+        with self.lock:
+            for event in self.events:
+                if event[0] > last_version:
+                    listener.put(event)
+            self.listeners.append(listener)
+        return listener
+
+    def unlisten(self, listener):
+        with self.lock:
+            self.listeners.remove(listener)
+
+def fake_employee(number):
+    return {"id": str(uuid.uuid4()),
+            "name": {"first_name": f"First{number}", "middle_name": "", "last_name": f"Last{number}"},
+            "age": 20 + number % 45, "title": "Engineer",
+            "address": {"address_1": f"{number} Main St", "address_2": "", "country": "US"},
+            "misc": ""}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real server
+    store = None
+    heartbeat = 15  # seconds between keep-alive comments on /events
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, code, data):
+        body = json.dumps(data).encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.command == 'GET' and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(code)
+        if self.command == 'GET':
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'null')
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == '/events':
+            self.stream_events()
+        elif url.path != '/getdata':
+            self.send_json(200, {'message': 'stand-in server'})
+        elif 'since' in query:
+            self.send_json(200, self.store.since(int(query['since'])))
+        elif 'id' in query:
+            with self.store.lock:
+                employee = self.store.employees.get(query['id'])
+            self.send_json(200, {'employees': [employee] if employee else []})
+        elif 'limit' in query:
+            self.send_json(200, self.store.page(int(query.get('offset', 0)), int(query['limit'])))
+        else:
+            with self.store.lock:
+                employees = list(self.store.employees.values())
+            self.send_json(200, {'employees': employees})
+
+    def do_POST(self):
+        data = self.read_json()
+        if self.path == '/postdata':
+            self.store.save(data)
+            self.send_json(200, {'message': 'Employee added'})
+        elif self.path == '/postdata/batch':
+            for record in data:
+                self.store.save(record)
+            self.send_json(200, {'message': f'{len(data)} employees added'})
+        else:
+            self.send_json(404, {'detail': 'Not Found'})
+
+    def do_PUT(self):
+        data = self.read_json()
+        if self.path == '/putdata/batch':
+            failed = [record['id'] for record in data if not self.store.update(record)]
+            self.send_json(200, {'failed': failed})
+        elif self.path.startswith('/putdata/'):
+            data['id'] = self.path.rsplit('/', 1)[1]
+            if self.store.update(data):
+                self.send_json(200, {'message': 'Employee updated'})
+            else:
+                self.send_json(404, {'detail': 'Employee not found'})
+        else:
+            self.send_json(404, {'detail': 'Not Found'})
+
+    def do_DELETE(self):
+        data = self.read_json()
+        if self.path == '/deletedata':
+            self.send_json(200, {'deleted': [id for id in data['ids'] if self.store.delete(id)]})
+        elif self.path.startswith('/deletedata/'):
+            if self.store.delete(self.path.rsplit('/', 1)[1]):
+                self.send_json(200, {'message': 'Employee deleted'})
+            else:
+                self.send_json(404, {'detail': 'Employee not found'})
+        else:
+            self.send_json(404, {'detail': 'Not Found'})
+
+    def stream_events(self):
+        listener = self.store.listen(int(self.headers.get('Last-Event-ID') or self.store.version))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.close_connection = True  # no Content-Length, the stream ends when the connection does
+        try:
+            while True:
+                try:
+                    version, kind, record = listener.get(timeout=self.heartbeat)
+                    message = f"id: {version}\nevent: {kind}\ndata: {json.dumps(record)}\n\n"
+                except queue.Empty:
+                    message = ": ping\n\n"
+                self.wfile.write(message.encode())
+                self.wfile.flush()
+        except OSError:  # the client went away
+            pass
+        finally:
+            self.store.unlisten(listener)
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory stand-in for the employee API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--seed', type=int, default=0, help="number of made-up employees to start with")
+    args = parser.parse_args()
+
+    Handler.store = Store()
+    for number in range(args.seed):
+        Handler.store.save(fake_employee(number))
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    print(f"Stand-in server on http://{args.host}:{args.port} with {args.seed} employees")
+    server.serve_forever()
+
+if __name__ == '__main__':
+    main()